@@ -0,0 +1,29 @@
+"""Add composite index for per-agent message history
+
+Revision ID: 20261015_0007
+Revises: 20260318_0006
+Create Date: 2026-10-15 00:00:07
+"""
+from __future__ import annotations
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20261015_0007"
+down_revision = "20260318_0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_messages_topic_agent_ts",
+        "messages",
+        ["topic_id", "agent_id", "ts"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_messages_topic_agent_ts", table_name="messages")
@@ -0,0 +1,31 @@
+"""Add run-scoped ordering indexes for trace reads
+
+Revision ID: 20261015_0008
+Revises: 20261015_0007
+Create Date: 2026-10-15 00:00:08
+"""
+from __future__ import annotations
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20261015_0008"
+down_revision = "20261015_0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_events_topic_run_ts", "events", ["topic_id", "run_id", "ts"], unique=False)
+    op.create_index(
+        "ix_artifacts_topic_run_created_at",
+        "artifacts",
+        ["topic_id", "run_id", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_artifacts_topic_run_created_at", table_name="artifacts")
+    op.drop_index("ix_events_topic_run_ts", table_name="events")
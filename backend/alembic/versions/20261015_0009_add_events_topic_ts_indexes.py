@@ -0,0 +1,31 @@
+"""Add topic-scoped ordering indexes for snapshot reads
+
+Revision ID: 20261015_0009
+Revises: 20261015_0008
+Create Date: 2026-10-15 00:00:09
+"""
+from __future__ import annotations
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20261015_0009"
+down_revision = "20261015_0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_events_topic_ts", "events", ["topic_id", "ts"], unique=False)
+    op.create_index(
+        "ix_events_topic_agent_kind_ts",
+        "events",
+        ["topic_id", "agent_id", "kind", "ts"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_events_topic_agent_kind_ts", table_name="events")
+    op.drop_index("ix_events_topic_ts", table_name="events")
@@ -0,0 +1,31 @@
+"""Add per-agent event and artifact-by-name ordering indexes
+
+Revision ID: 20261015_0010
+Revises: 20261015_0009
+Create Date: 2026-10-15 00:00:10
+"""
+from __future__ import annotations
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20261015_0010"
+down_revision = "20261015_0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_events_topic_agent_ts", "events", ["topic_id", "agent_id", "ts"], unique=False)
+    op.create_index(
+        "ix_artifacts_topic_name_created_at",
+        "artifacts",
+        ["topic_id", "name", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_artifacts_topic_name_created_at", table_name="artifacts")
+    op.drop_index("ix_events_topic_agent_ts", table_name="events")
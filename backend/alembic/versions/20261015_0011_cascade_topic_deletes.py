@@ -0,0 +1,47 @@
+"""Cascade topic deletes to runs, events, artifacts and messages
+
+Revision ID: 20261015_0011
+Revises: 20261015_0010
+Create Date: 2026-10-15 00:00:11
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20261015_0011"
+down_revision = "20261015_0010"
+branch_labels = None
+depends_on = None
+
+_TOPIC_CHILD_TABLES = ("runs", "events", "artifacts", "messages")
+
+
+def _topic_fk_names(table: str) -> list[str]:
+    # The initial schema left these constraints unnamed, so look up whatever
+    # name the database gave them instead of assuming the default.
+    return [
+        fk["name"]
+        for fk in sa.inspect(op.get_bind()).get_foreign_keys(table)
+        if fk["referred_table"] == "topics" and fk["constrained_columns"] == ["topic_id"] and fk["name"]
+    ]
+
+
+def _recreate_topic_fk(table: str, *, ondelete: str | None) -> None:
+    names = _topic_fk_names(table)
+    for name in names:
+        op.drop_constraint(name, table, type_="foreignkey")
+    constraint = names[0] if names else f"{table}_topic_id_fkey"
+    op.create_foreign_key(constraint, table, "topics", ["topic_id"], ["id"], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    for table in _TOPIC_CHILD_TABLES:
+        _recreate_topic_fk(table, ondelete="CASCADE")
+
+
+def downgrade() -> None:
+    for table in _TOPIC_CHILD_TABLES:
+        _recreate_topic_fk(table, ondelete=None)
@@ -0,0 +1,29 @@
+"""Add artifacts (topic_id, created_at) index for bounded snapshot reads
+
+Revision ID: 20261015_0012
+Revises: 20261015_0011
+Create Date: 2026-10-15 00:00:12
+"""
+from __future__ import annotations
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20261015_0012"
+down_revision = "20261015_0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_artifacts_topic_created_at",
+        "artifacts",
+        ["topic_id", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_artifacts_topic_created_at", table_name="artifacts")
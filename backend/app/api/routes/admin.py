@@ -16,7 +16,7 @@ router = APIRouter(prefix="/api/admin", tags=["admin"])
 
 @router.get("/overview", response_model=AdminOverviewResponse)
 async def admin_overview(_admin: dict[str, str] = Depends(require_admin)) -> AdminOverviewResponse:
-    return build_admin_overview_snapshot()
+    return await asyncio.to_thread(build_admin_overview_snapshot)
 
 
 @router.websocket("/ws")
@@ -42,7 +42,7 @@ async def admin_ws(websocket: WebSocket, token: str | None = None) -> None:
 
     try:
         while True:
-            snapshot = build_admin_overview_snapshot()
+            snapshot = await asyncio.to_thread(build_admin_overview_snapshot)
             metrics_event = build_event(
                 topic_id=channel,
                 run_id=f"admin-{snapshot.ts}",
@@ -35,7 +35,7 @@ async def approve_run_module(
             },
         )
         await store.add_event(warn_event)
-        await event_bus.publish(run_payload["topicId"], warn_event)
+        event_bus.publish_nowait(run_payload["topicId"], warn_event)
 
     run = await store.get_run(runId)
     if run is None:
@@ -124,7 +124,7 @@ async def approve_run_module(
         payload=event_payload,
     )
     await store.add_event(event)
-    await event_bus.publish(run["topicId"], event)
+    event_bus.publish_nowait(run["topicId"], event)
 
     return RunApproveResponse(
         ok=True,
@@ -1,3 +1,5 @@
+import asyncio
+
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from app.core.config import get_settings
@@ -24,7 +26,8 @@ def _build_auth_response(*, user: dict[str, str]) -> AuthTokenResponse:
 
 @router.post("/login", response_model=AuthTokenResponse)
 async def login(payload: LoginRequest) -> AuthTokenResponse:
-    user = authenticate_user(payload.username or "", payload.password)
+    # Password hashing and the user lookup block; keep them off the event loop.
+    user = await asyncio.to_thread(authenticate_user, payload.username or "", payload.password)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -37,7 +40,12 @@ async def login(payload: LoginRequest) -> AuthTokenResponse:
 @router.post("/register", response_model=AuthTokenResponse)
 async def register(payload: RegisterRequest) -> AuthTokenResponse:
     try:
-        user = register_user(payload.username or payload.email or "", payload.password, role=UserRole.user.value)
+        user = await asyncio.to_thread(
+            register_user,
+            payload.username or payload.email or "",
+            payload.password,
+            role=UserRole.user.value,
+        )
     except ValueError as exc:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
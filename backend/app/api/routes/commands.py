@@ -49,6 +49,7 @@ async def command_agent(
             "args": payload.args,
         }
 
+    queued_at = now_ms()
     event = build_event(
         topic_id=topicId,
         run_id=run_id,
@@ -57,10 +58,11 @@ async def command_agent(
         severity=Severity.info,
         summary=summary,
         payload=event_payload,
+        ts=queued_at,
     )
 
     await store.add_event(event)
-    await event_bus.publish(topicId, event)
+    event_bus.publish_nowait(topicId, event)
 
     return AgentCommandResponse(
         ok=True,
@@ -69,5 +71,5 @@ async def command_agent(
         topicId=topicId,
         agentId=agentId,
         runId=run_id,
-        queuedAt=now_ms(),
+        queuedAt=queued_at,
     )
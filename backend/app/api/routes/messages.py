@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from app.core.security import get_current_user
 from app.models.schemas import (
     AgentId,
+    Event,
     EventKind,
     Message,
     MessageCreateRequest,
@@ -18,16 +19,16 @@ from app.store import store
 router = APIRouter(prefix="/api/topics", tags=["messages"])
 
 
-async def _emit_message_created_event(
+def _build_message_created_event(
     *,
     topic_id: str,
     agent_id: AgentId,
     message: dict,
     fallback_run_id: str | None,
-) -> None:
+) -> Event:
     run_id = message.get("runId") or fallback_run_id or "run-chat-session"
 
-    event = build_event(
+    return build_event(
         topic_id=topic_id,
         run_id=run_id,
         agent_id=agent_id,
@@ -36,8 +37,6 @@ async def _emit_message_created_event(
         summary=f"message created ({message['role']})",
         payload={"message": message},
     )
-    await store.add_event(event)
-    await event_bus.publish(topic_id, event)
 
 
 @router.get(
@@ -98,18 +97,17 @@ async def create_messages(
         assistant_text=str(assistant_message.get("content") or ""),
     )
 
-    await _emit_message_created_event(
-        topic_id=topicId,
-        agent_id=agentId,
-        message=user_message,
-        fallback_run_id=run_id,
-    )
-    await _emit_message_created_event(
-        topic_id=topicId,
-        agent_id=agentId,
-        message=assistant_message,
-        fallback_run_id=run_id,
-    )
+    events = [
+        _build_message_created_event(
+            topic_id=topicId,
+            agent_id=agentId,
+            message=message,
+            fallback_run_id=run_id,
+        )
+        for message in (user_message, assistant_message)
+    ]
+    await store.add_events(events)
+    event_bus.publish_many_nowait(topicId, events)
 
     return MessageListResponse(
         messages=[Message(**user_message), Message(**assistant_message)]
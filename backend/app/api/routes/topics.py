@@ -6,6 +6,7 @@ from fastapi.responses import FileResponse
 from app.core.security import get_current_user
 from app.models.schemas import (
     AgentSnapshot,
+    ArtifactListResponse,
     ArtifactRef,
     Event,
     SnapshotActiveRun,
@@ -49,6 +50,26 @@ async def delete_topic(topicId: str, _user: str = Depends(get_current_user)) ->
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Topic not found") from exc
 
 
+@router.get("/{topicId}/artifacts", response_model=ArtifactListResponse, response_model_exclude_none=True)
+async def list_artifacts(
+    topicId: str,
+    before: str | None = Query(default=None),
+    limit: int = Query(default=200, ge=1, le=1000),
+    _user: str = Depends(get_current_user),
+) -> ArtifactListResponse:
+    try:
+        page = await store.list_artifacts(topicId, limit=limit, before=before)
+    except KeyError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Topic not found") from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    return ArtifactListResponse(
+        items=[ArtifactRef(**item) for item in page["items"]],
+        nextCursor=page["nextCursor"],
+    )
+
+
 @router.get("/{topicId}/artifacts/{name}")
 async def get_artifact_content(
     topicId: str,
@@ -76,10 +97,11 @@ async def get_artifact_content(
 async def get_snapshot(
     topicId: str,
     limit: int = Query(default=50, ge=1, le=500),
+    artifactLimit: int = Query(default=200, ge=1, le=1000),
     _user: str = Depends(get_current_user),
 ) -> SnapshotResponse:
     try:
-        snapshot = await store.get_snapshot(topicId, limit=limit)
+        snapshot = await store.get_snapshot(topicId, limit=limit, artifact_limit=artifactLimit)
     except KeyError as exc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Topic not found") from exc
 
@@ -88,5 +110,6 @@ async def get_snapshot(
         agents=[AgentSnapshot(**item) for item in snapshot["agents"]],
         events=[Event(**item) for item in snapshot["events"]],
         artifacts=[ArtifactRef(**item) for item in snapshot["artifacts"]],
+        artifactsCursor=snapshot["artifactsCursor"],
         activeRun=SnapshotActiveRun(**snapshot["activeRun"]) if snapshot.get("activeRun") else None,
     )
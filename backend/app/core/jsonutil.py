@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+import orjson
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so either type can be caught.
+JSONDecodeError = orjson.JSONDecodeError
+json_loads = orjson.loads
+
+
+def json_dumps(value: object) -> str:
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+def json_dumps_pretty(value: object) -> bytes:
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2)
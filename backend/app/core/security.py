@@ -36,7 +36,7 @@ bearer_scheme = HTTPBearer(auto_error=False)
 
 
 def _now_ms() -> int:
-    return int(time.time() * 1000)
+    return time.time_ns() // 1_000_000
 
 
 def _normalize_login(login: str) -> str:
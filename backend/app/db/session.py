@@ -26,9 +26,16 @@ def _resolve_database_url() -> str:
 
 DATABASE_URL = _resolve_database_url()
 
+_settings = get_settings()
+
+# Store calls run in worker threads (asyncio.to_thread), so the pool is sized
+# for concurrent sessions rather than SQLAlchemy's default of 5 + 10 overflow.
 ENGINE = create_engine(
     DATABASE_URL,
     pool_pre_ping=True,
+    pool_size=max(1, _settings.database_pool_size),
+    max_overflow=max(0, _settings.database_max_overflow),
+    pool_recycle=_settings.database_pool_recycle_seconds,
 )
 
 SessionLocal = sessionmaker(
@@ -5,6 +5,7 @@ from app.api import api_router
 from app.core.config import get_settings
 from app.core.security import seed_default_users
 from app.models.schemas import HealthResponse
+from app.services.runner import fake_runner
 from app.store import init_db
 
 settings = get_settings()
@@ -32,6 +33,11 @@ def on_startup() -> None:
     seed_default_users()
 
 
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    await fake_runner.drain_events()
+
+
 @app.get("/api/health", response_model=HealthResponse, tags=["health"])
 async def health() -> HealthResponse:
     return HealthResponse(status="ok")
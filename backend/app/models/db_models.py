@@ -28,7 +28,7 @@ class RunTable(SQLModel, table=True):
     __table_args__ = (Index("ix_runs_topic_created_at", "topic_id", "created_at"),)
 
     id: str = Field(primary_key=True, index=True)
-    topic_id: str = Field(foreign_key="topics.id", index=True)
+    topic_id: str = Field(foreign_key="topics.id", ondelete="CASCADE", index=True)
     history_title: str | None = Field(default=None, index=True)
     status: str = Field(index=True)
     created_at: int = Field(index=True)
@@ -49,10 +49,14 @@ class EventTable(SQLModel, table=True):
     __table_args__ = (
         Index("ix_events_topic_created_at", "topic_id", "created_at"),
         Index("ix_events_run_created_at", "run_id", "created_at"),
+        Index("ix_events_topic_run_ts", "topic_id", "run_id", "ts"),
+        Index("ix_events_topic_ts", "topic_id", "ts"),
+        Index("ix_events_topic_agent_kind_ts", "topic_id", "agent_id", "kind", "ts"),
+        Index("ix_events_topic_agent_ts", "topic_id", "agent_id", "ts"),
     )
 
     event_id: str = Field(primary_key=True, index=True)
-    topic_id: str = Field(foreign_key="topics.id", index=True)
+    topic_id: str = Field(foreign_key="topics.id", ondelete="CASCADE", index=True)
     run_id: str = Field(index=True)
     agent_id: str = Field(index=True)
     kind: str = Field(index=True)
@@ -67,10 +71,15 @@ class EventTable(SQLModel, table=True):
 
 class ArtifactTable(SQLModel, table=True):
     __tablename__ = "artifacts"
-    __table_args__ = (Index("ix_artifacts_topic_run", "topic_id", "run_id"),)
+    __table_args__ = (
+        Index("ix_artifacts_topic_run", "topic_id", "run_id"),
+        Index("ix_artifacts_topic_run_created_at", "topic_id", "run_id", "created_at"),
+        Index("ix_artifacts_topic_name_created_at", "topic_id", "name", "created_at"),
+        Index("ix_artifacts_topic_created_at", "topic_id", "created_at"),
+    )
 
     artifact_id: str = Field(primary_key=True, index=True)
-    topic_id: str = Field(foreign_key="topics.id", index=True)
+    topic_id: str = Field(foreign_key="topics.id", ondelete="CASCADE", index=True)
     run_id: str = Field(index=True)
     name: str = Field(index=True)
     content_type: str
@@ -80,9 +89,10 @@ class ArtifactTable(SQLModel, table=True):
 
 class MessageTable(SQLModel, table=True):
     __tablename__ = "messages"
+    __table_args__ = (Index("ix_messages_topic_agent_ts", "topic_id", "agent_id", "ts"),)
 
     message_id: str = Field(primary_key=True, index=True)
-    topic_id: str = Field(foreign_key="topics.id", index=True)
+    topic_id: str = Field(foreign_key="topics.id", ondelete="CASCADE", index=True)
     run_id: str | None = Field(default=None, index=True)
     agent_id: str = Field(index=True)
     role: str = Field(index=True)
@@ -267,9 +267,17 @@ class SnapshotResponse(BaseModel):
     agents: list[AgentSnapshot]
     events: list[Event]
     artifacts: list[ArtifactRef] = Field(default_factory=list)
+    # Present when the snapshot holds only the newest artifacts; page back with
+    # GET /api/topics/{topicId}/artifacts?before=<cursor>.
+    artifactsCursor: str | None = None
     activeRun: SnapshotActiveRun | None = None
 
 
+class ArtifactListResponse(BaseModel):
+    items: list[ArtifactRef] = Field(default_factory=list)
+    nextCursor: str | None = None
+
+
 class ModuleConfig(BaseModel):
     enabled: bool = True
     model: str = "deepseek-chat"
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import time
 from typing import Any
 
@@ -8,6 +7,7 @@ from sqlalchemy import cast, desc, func, or_
 from sqlalchemy.sql.sqltypes import Integer
 from sqlmodel import select
 
+from app.core.jsonutil import JSONDecodeError, json_loads
 from app.db import SessionLocal
 from app.models.db_models import EventTable, RunTable
 from app.models.schemas import (
@@ -26,7 +26,7 @@ ACTIVE_RUN_STATUSES = ("queued", "running", "paused")
 
 
 def _now_ms() -> int:
-    return int(time.time() * 1000)
+    return time.time_ns() // 1_000_000
 
 
 def _to_int(value: object | None) -> int:
@@ -85,8 +85,8 @@ def _extract_module_from_payload(agent_id: str, payload_json: str | None) -> str
     if not payload_json:
         return agent_id or "unknown"
     try:
-        payload = json.loads(payload_json)
-    except json.JSONDecodeError:
+        payload = json_loads(payload_json)
+    except JSONDecodeError:
         return agent_id or "unknown"
     module = payload.get("module") if isinstance(payload, dict) else None
     if isinstance(module, str) and module:
@@ -98,8 +98,8 @@ def _extract_message(summary: str, payload_json: str | None) -> str:
     if not payload_json:
         return summary
     try:
-        payload = json.loads(payload_json)
-    except json.JSONDecodeError:
+        payload = json_loads(payload_json)
+    except JSONDecodeError:
         return summary
 
     if isinstance(payload, dict):
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import logging
+import time
+from collections import OrderedDict
 from typing import Literal, TypedDict
 
 import httpx
+import orjson
 
 from app.core.config import get_settings
 
@@ -30,23 +34,49 @@ def _format_exception(exc: Exception) -> str:
     return exc.__class__.__name__
 
 
+def _payload_cache_key(payload: dict[str, object]) -> str:
+    encoded = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
 class DeepSeekClient:
     def __init__(self) -> None:
         self._settings = get_settings()
+        # Exact-match response cache: payload digest -> (stored_at, content).
+        self._response_cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def _cache_get(self, key: str) -> str | None:
+        ttl = float(self._settings.deepseek_response_cache_ttl_seconds)
+        entry = self._response_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, content = entry
+        if time.monotonic() - stored_at >= ttl:
+            del self._response_cache[key]
+            return None
+        self._response_cache.move_to_end(key)
+        return content
+
+    def _cache_put(self, key: str, content: str) -> None:
+        self._response_cache[key] = (time.monotonic(), content)
+        self._response_cache.move_to_end(key)
+        max_entries = max(1, int(self._settings.deepseek_response_cache_max_entries))
+        while len(self._response_cache) > max_entries:
+            self._response_cache.popitem(last=False)
 
     @property
     def is_configured(self) -> bool:
         api_key = self._settings.deepseek_api_key
         return isinstance(api_key, str) and api_key.strip() != ""
 
-    async def chat(
+    def _build_request(
         self,
         messages: list[ChatMessage],
         *,
-        model: str | None = None,
-        temperature: float = 0.2,
-        max_tokens: int | None = None,
-    ) -> str:
+        model: str | None,
+        temperature: float,
+        max_tokens: int | None,
+    ) -> tuple[str, dict[str, str], dict[str, object], str]:
         if not messages:
             raise DeepSeekClientError("DeepSeek chat requires at least one message")
 
@@ -69,12 +99,63 @@ class DeepSeekClient:
         if max_tokens is not None:
             payload["max_tokens"] = max_tokens
 
-        timeout_value = max(float(self._settings.deepseek_timeout_seconds), 1.0)
-        timeout = httpx.Timeout(timeout_value)
         headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
         }
+        return url, headers, payload, resolved_model
+
+    def _lookup_cached(
+        self,
+        payload: dict[str, object],
+        resolved_model: str,
+        message_count: int,
+    ) -> tuple[str, str | None]:
+        if float(self._settings.deepseek_response_cache_ttl_seconds) <= 0:
+            return "", None
+        cache_key = _payload_cache_key(payload)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            logger.debug("DeepSeek response cache hit (model=%s, messages=%s)", resolved_model, message_count)
+        return cache_key, cached
+
+    @staticmethod
+    def _error_detail(response: httpx.Response) -> str:
+        detail = ""
+        try:
+            data = response.json()
+            if isinstance(data, dict):
+                error_node = data.get("error")
+                if isinstance(error_node, dict):
+                    detail = str(error_node.get("message") or "").strip()
+                if not detail:
+                    detail = str(data.get("detail") or "").strip()
+        except Exception:
+            detail = ""
+        if not detail:
+            detail = response.text.strip() or response.reason_phrase
+        return detail
+
+    async def chat(
+        self,
+        messages: list[ChatMessage],
+        *,
+        model: str | None = None,
+        temperature: float = 0.2,
+        max_tokens: int | None = None,
+    ) -> str:
+        url, headers, payload, resolved_model = self._build_request(
+            messages,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        cache_key, cached = self._lookup_cached(payload, resolved_model, len(messages))
+        if cached is not None:
+            return cached
+
+        timeout_value = max(float(self._settings.deepseek_timeout_seconds), 1.0)
+        timeout = httpx.Timeout(timeout_value)
 
         max_attempts = max(1, int(self._settings.deepseek_max_retries) + 1)
         backoff_seconds = max(float(self._settings.deepseek_retry_backoff_seconds), 0.0)
@@ -127,19 +208,7 @@ class DeepSeekClient:
             ) from last_error
 
         if response.status_code >= 400:
-            detail = ""
-            try:
-                data = response.json()
-                if isinstance(data, dict):
-                    error_node = data.get("error")
-                    if isinstance(error_node, dict):
-                        detail = str(error_node.get("message") or "").strip()
-                    if not detail:
-                        detail = str(data.get("detail") or "").strip()
-            except Exception:
-                detail = ""
-            if not detail:
-                detail = response.text.strip() or response.reason_phrase
+            detail = self._error_detail(response)
             logger.warning(
                 "DeepSeek API error (status=%s, model=%s): %s",
                 response.status_code,
@@ -166,7 +235,10 @@ class DeepSeekClient:
         if not isinstance(content, str) or not content.strip():
             raise DeepSeekClientError("DeepSeek response missing choices[0].message.content")
 
-        return content.strip()
+        content = content.strip()
+        if cache_key:
+            self._cache_put(cache_key, content)
+        return content
 
 
 deepseek_client = DeepSeekClient()
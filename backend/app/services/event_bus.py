@@ -1,17 +1,30 @@
 ﻿from __future__ import annotations
 
 import asyncio
-from collections import defaultdict
+import logging
+from collections import defaultdict, deque
 
 from fastapi import WebSocket
 
+from app.core.config import get_settings
 from app.models.schemas import Event
 
+logger = logging.getLogger(__name__)
+
+# "Try again later": the client reconnects and reloads the topic snapshot.
+_LAGGING_CLOSE_CODE = 1013
+
 
 class EventBus:
-    def __init__(self) -> None:
+    def __init__(self, max_pending_frames: int | None = None) -> None:
         self._lock = asyncio.Lock()
         self._connections: dict[str, set[WebSocket]] = defaultdict(set)
+        # Each subscriber has its own outbox and sender task, so one slow client
+        # neither holds back nor loses frames for the others on the topic.
+        self._outboxes: dict[WebSocket, deque[str]] = {}
+        self._senders: dict[WebSocket, asyncio.Task[None]] = {}
+        self._closing: set[asyncio.Task[None]] = set()
+        self._max_pending_frames = max_pending_frames or get_settings().event_bus_max_pending_frames
 
     async def connect(self, topic_id: str, websocket: WebSocket) -> None:
         await websocket.accept()
@@ -20,6 +33,7 @@ class EventBus:
 
     async def disconnect(self, topic_id: str, websocket: WebSocket) -> None:
         async with self._lock:
+            self._outboxes.pop(websocket, None)
             sockets = self._connections.get(topic_id)
             if not sockets:
                 return
@@ -27,25 +41,72 @@ class EventBus:
             if not sockets:
                 self._connections.pop(topic_id, None)
 
-    async def publish(self, topic_id: str, event: Event) -> None:
-        payload = event.model_dump(mode="json", exclude_none=True)
+    def publish_nowait(self, topic_id: str, event: Event) -> None:
+        """Queue an event for the topic's subscribers without waiting on sends."""
+        self.publish_many_nowait(topic_id, [event])
 
-        async with self._lock:
-            sockets = list(self._connections.get(topic_id, set()))
+    def publish_many_nowait(self, topic_id: str, events: list[Event]) -> None:
+        """Queue several events for a topic behind a single sender wake-up per subscriber."""
+        sockets = self._connections.get(topic_id)
+        if not events or not sockets:
+            return
+
+        # Serialize once for every subscriber instead of per send_json call.
+        frames = [event.model_dump_json(exclude_none=True) for event in events]
+        loop = asyncio.get_running_loop()
+        for socket in list(sockets):
+            outbox = self._outboxes.get(socket)
+            if outbox is None:
+                outbox = self._outboxes[socket] = deque()
+            if len(outbox) + len(frames) > self._max_pending_frames:
+                self._evict_lagging(topic_id, socket, len(outbox))
+                continue
+            outbox.extend(frames)
+            if socket not in self._senders:
+                self._senders[socket] = loop.create_task(self._send_loop(topic_id, socket))
+
+    def _evict_lagging(self, topic_id: str, websocket: WebSocket, pending: int) -> None:
+        """Drop a subscriber that fell too far behind rather than silently skipping its frames."""
+        logger.warning(
+            "Closing lagging event subscriber (topic=%s, pending=%s, limit=%s)",
+            topic_id,
+            pending,
+            self._max_pending_frames,
+        )
+        self._outboxes.pop(websocket, None)
+        sockets = self._connections.get(topic_id)
+        if sockets is not None:
+            sockets.discard(websocket)
+            if not sockets:
+                self._connections.pop(topic_id, None)
+
+        task = asyncio.get_running_loop().create_task(self._close_quietly(websocket))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
 
-        stale_sockets: list[WebSocket] = []
-        for socket in sockets:
-            try:
-                await socket.send_json(payload)
-            except Exception:
-                stale_sockets.append(socket)
+    @staticmethod
+    async def _close_quietly(websocket: WebSocket) -> None:
+        try:
+            await websocket.close(code=_LAGGING_CLOSE_CODE)
+        except Exception:
+            pass
 
-        for socket in stale_sockets:
-            await self.disconnect(topic_id, socket)
+    async def _send_loop(self, topic_id: str, websocket: WebSocket) -> None:
+        try:
+            while True:
+                outbox = self._outboxes.get(websocket)
+                if not outbox:
+                    return
+                await websocket.send_text(outbox.popleft())
+        except Exception:
+            await self.disconnect(topic_id, websocket)
+        finally:
+            self._senders.pop(websocket, None)
+            if not self._outboxes.get(websocket):
+                self._outboxes.pop(websocket, None)
 
     async def send_personal(self, websocket: WebSocket, event: Event) -> None:
-        payload = event.model_dump(mode="json", exclude_none=True)
-        await websocket.send_json(payload)
+        await websocket.send_text(event.model_dump_json(exclude_none=True))
 
 
 event_bus = EventBus()
@@ -5,18 +5,19 @@ import json
 import logging
 import os
 import re
+import secrets
 import shutil
 import subprocess
 import traceback
 from pathlib import Path
 from types import SimpleNamespace
 from typing import Any
-from uuid import uuid4
 
 from app.core.config import get_settings
 from app.core.run_config import get_default_run_config
-from app.models.schemas import AgentId, ArtifactRef, EventKind, RunConfig, Severity
+from app.models.schemas import AgentId, ArtifactRef, Event, EventKind, RunConfig, Severity
 from app.services.approval_manager import approval_manager
+from app.services.event_bus import event_bus
 from app.services.runner import build_event, fake_runner
 from app.services.runtime_config_builder import (
     ResearchAgentRuntime,
@@ -287,11 +288,13 @@ class ResearchAgentPipelineRunner:
         runtime: ResearchAgentRuntime,
     ) -> Path:
         seed_path = runtime.idea_output_root / "output" / "idea_result.json"
-        seed_path.parent.mkdir(parents=True, exist_ok=True)
-        seed_path.write_text(
-            json.dumps(self._build_seed_idea_payload(runtime), ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+        seed_content = json.dumps(self._build_seed_idea_payload(runtime), ensure_ascii=False, indent=2)
+
+        def _write_seed() -> None:
+            seed_path.parent.mkdir(parents=True, exist_ok=True)
+            seed_path.write_text(seed_content, encoding="utf-8")
+
+        await asyncio.to_thread(_write_seed)
 
         await self._register_artifact(
             topic_id=topic_id,
@@ -322,27 +325,28 @@ class ResearchAgentPipelineRunner:
         env: dict[str, str],
         log_path: Path,
     ) -> subprocess.CompletedProcess[str]:
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-
+        # The command and its log writes share one worker thread; agent logs
+        # can be large and must not be written on the event loop.
         def _invoke() -> subprocess.CompletedProcess[str]:
-            return subprocess.run(
-                args,
-                cwd=str(cwd),
-                env=env,
-                capture_output=True,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
-            )
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                result = subprocess.run(
+                    args,
+                    cwd=str(cwd),
+                    env=env,
+                    capture_output=True,
+                    text=True,
+                    encoding="utf-8",
+                    errors="replace",
+                )
+            except Exception:
+                log_path.write_text(traceback.format_exc(), encoding="utf-8")
+                raise
+            combined = ((result.stdout or "") + ("\n" if result.stdout and result.stderr else "") + (result.stderr or "")).strip()
+            log_path.write_text(combined, encoding="utf-8")
+            return result
 
-        try:
-            result = await asyncio.to_thread(_invoke)
-        except Exception:
-            log_path.write_text(traceback.format_exc(), encoding="utf-8")
-            raise
-        combined = ((result.stdout or "") + ("\n" if result.stdout and result.stderr else "") + (result.stderr or "")).strip()
-        log_path.write_text(combined, encoding="utf-8")
-        return result
+        return await asyncio.to_thread(_invoke)
 
     async def _emit_event(
         self,
@@ -382,7 +386,7 @@ class ResearchAgentPipelineRunner:
         summary: str | None = None,
     ) -> ArtifactRef:
         content_type = _artifact_content_type(path)
-        raw = path.read_text(encoding="utf-8")
+        raw = await asyncio.to_thread(path.read_text, encoding="utf-8")
         content: str | dict[str, Any]
         if content_type == "application/json":
             try:
@@ -540,6 +544,7 @@ class ResearchAgentPipelineRunner:
             payload={"stage": "review", "topic": runtime.topic_text},
         )
 
+        await fake_runner._flush_events(run_id)
         result = await self._run_command(
             args=self._build_survey_docker_args(runtime),
             cwd=runtime.research_agent_root,
@@ -667,6 +672,7 @@ class ResearchAgentPipelineRunner:
             payload={"stage": "ideation", "topic": runtime.topic_text},
         )
 
+        await fake_runner._flush_events(run_id)
         result = await self._run_command(
             args=self._build_idea_docker_args(runtime),
             cwd=runtime.research_agent_root,
@@ -818,6 +824,7 @@ class ResearchAgentPipelineRunner:
         shutil.copy(idea_result_path, target_idea_json)
         shutil.copy(idea_result_path, target_idea_result_json)
 
+        await fake_runner._flush_events(run_id)
         result = await self._run_command(
             args=self._build_experiment_docker_args(runtime),
             cwd=runtime.research_agent_root,
@@ -886,7 +893,7 @@ class ResearchAgentPipelineRunner:
         return artifact_names
 
     async def run_pipeline(self, topic_id: str, run_id: str) -> None:
-        trace_id = str(uuid4())
+        trace_id = secrets.token_hex(16)
         active_agent = AgentId.review
         active_runtime: SimpleNamespace | None = None
 
@@ -1018,49 +1025,59 @@ class ResearchAgentPipelineRunner:
             )
         except Exception as exc:
             logger.exception("Research agent pipeline failed (topic=%s run=%s)", topic_id, run_id)
-            await store.update_run_runtime(
-                run_id,
-                topic_id=topic_id,
-                status="failed",
-                current_module=active_runtime.module if active_runtime is not None else None,
-                awaiting_approval=False,
-                awaiting_module=None,
-                touch_ended_at=True,
-            )
-            if active_runtime is not None:
-                await fake_runner._emit_module_failed(
-                    topic_id=topic_id,
-                    run_id=run_id,
-                    trace_id=trace_id,
-                    module_runtime=active_runtime,
-                    exc=exc,
-                )
-            await fake_runner._update_agent(
-                topic_id=topic_id,
-                run_id=run_id,
-                agent_id=active_agent,
-                status="failed",
-                progress=1.0,
-                summary="pipeline failed",
-                trace_id=trace_id,
-            )
-
             payload: dict[str, Any] = {
                 "error": str(exc) or exc.__class__.__name__,
                 "errorType": exc.__class__.__name__,
             }
             if isinstance(exc, ResearchAgentExecutionError) and exc.log_path is not None:
                 payload["logPath"] = str(exc.log_path)
-            await self._emit_event(
+
+            failure_events: list[Event] = []
+            if active_runtime is not None:
+                failure_events.append(
+                    fake_runner._module_failed_event(
+                        topic_id=topic_id,
+                        run_id=run_id,
+                        trace_id=trace_id,
+                        module_runtime=active_runtime,
+                        exc=exc,
+                    )
+                )
+            failure_events.append(
+                fake_runner._agent_status_event(
+                    topic_id=topic_id,
+                    run_id=run_id,
+                    agent_id=active_agent,
+                    status="failed",
+                    progress=1.0,
+                    summary="pipeline failed",
+                    trace_id=trace_id,
+                )
+            )
+            failure_events.append(
+                build_event(
+                    topic_id=topic_id,
+                    run_id=run_id,
+                    agent_id=active_agent,
+                    kind=EventKind.event_emitted,
+                    severity=Severity.error,
+                    summary="real agent pipeline failed",
+                    payload=payload,
+                    trace_id=trace_id,
+                )
+            )
+            await store.fail_run(
+                run_id,
                 topic_id=topic_id,
-                run_id=run_id,
-                agent_id=active_agent,
-                trace_id=trace_id,
-                summary="real agent pipeline failed",
-                severity=Severity.error,
-                payload=payload,
+                current_module=active_runtime.module if active_runtime is not None else None,
+                events=failure_events,
             )
+            event_bus.publish_many_nowait(topic_id, failure_events)
         finally:
+            try:
+                await fake_runner._flush_events(run_id, wait=True)
+            except Exception:
+                logger.exception("Failed to persist pending events (topic=%s run=%s)", topic_id, run_id)
             await approval_manager.clear_run(run_id)
 
 
@@ -1,16 +1,18 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
+import secrets
 import time
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import Any, Literal
+from functools import lru_cache, partial
+from typing import Any, Awaitable, Callable, Literal, TypeVar
 from uuid import uuid4
 
 from app.core.config import get_settings
+from app.core.jsonutil import JSONDecodeError, json_dumps, json_dumps_pretty, json_loads
 from app.core.run_config import get_default_run_config
-from app.db import SessionLocal
 from app.models.schemas import AgentId, ArtifactRef, Event, EventKind, RunConfig, Severity
 from app.services.approval_manager import ApprovalDecision, approval_manager
 from app.services.deepseek_client import DeepSeekClientError, deepseek_client
@@ -21,9 +23,50 @@ from app.store import store
 
 logger = logging.getLogger(__name__)
 
+
 SubtaskStatus = Literal["pending", "running", "completed", "failed"]
 StageName = Literal["review", "ideation", "experiment", "feedback"]
 ModuleName = Literal["review", "ideation", "experiment"]
+T = TypeVar("T")
+
+_FALLBACK_METRICS = {"accuracy": 0.78, "f1": 0.74, "robustness": 0.71}
+
+# Shared payloads for fixed-shape events. Event payloads are only ever
+# serialized, never mutated, so one instance per shape is reused.
+_PAYLOAD_LLM_FALLBACK: dict[str, Any] = {"provider": "deepseek", "fallback": True}
+_PAYLOAD_LLM_OK: dict[str, Any] = {"provider": "deepseek", "fallback": False}
+_PAYLOAD_CONFIG_FALLBACK: dict[str, Any] = {"fallback": True}
+_PAYLOAD_SIM_TEMP_FAILURE: dict[str, Any] = {"errorCode": "SIM_TEMP_FAILURE", "retryable": True}
+_PAYLOAD_RUN_COMPLETED: dict[str, Any] = {"phase": "completed"}
+_STAGE_PAYLOADS: dict[str, dict[str, Any]] = {
+    stage: {"stage": stage} for stage in ("review", "ideation", "experiment", "feedback")
+}
+_EVENT_FLUSH_THRESHOLD = 32
+_EVENT_WRITE_BATCH_LIMIT = 128
+_EVENT_WRITE_BACKLOG_LIMIT = 64
+# Backoff between attempts at persisting one coalesced batch; once these run
+# out the batch is reported to its runs' final flush instead of dropped quietly.
+_EVENT_WRITE_RETRY_DELAYS = (0.5, 2.0, 5.0)
+_EVENT_FLUSH_STATUSES = {"completed", "failed", "skipped"}
+
+# Fixed prompt text per generation step. Keeping each step's system policy
+# byte-identical across runs lets the provider's prefix cache match.
+_PLANNER_SYSTEM_POLICY = "You are a planning module that decomposes agent work into executable subtasks."
+_REVIEW_SYSTEM_POLICY = "You are the review agent. Produce a rigorous, topic-grounded literature survey in markdown."
+_REVIEW_FINAL_TASK = "Generate survey.md using <upstream_reference>."
+_IDEATION_SYSTEM_POLICY = "You are the ideation agent. Produce implementation-ready ideas."
+_IDEATION_FINAL_TASK = "Generate ideas.md from <upstream_reference>."
+_EXPERIMENT_SYSTEM_POLICY = "You are the experiment agent. Return strict JSON only."
+_EXPERIMENT_FINAL_TASK = "Generate strict JSON results from <upstream_reference>."
+_EXPERIMENT_REPORT_SYSTEM_POLICY = "You are the experiment reporting agent. Produce a detailed markdown report."
+_EXPERIMENT_REPORT_FINAL_TASK = "Generate result.md from <upstream_reference>."
+_IDEATION_FEEDBACK_SYSTEM_POLICY = "You are the ideation feedback agent."
+_IDEATION_FEEDBACK_FINAL_TASK = "Generate a concise feedback plan."
+
+_AGENT_IDEATION = AgentId.ideation
+_EVT_EMITTED = EventKind.event_emitted
+_SEV_INFO = Severity.info
+_SEV_ERROR = Severity.error
 
 
 @dataclass
@@ -38,7 +81,7 @@ class ModuleRuntime:
 
 
 def now_ms() -> int:
-    return int(time.time() * 1000)
+    return time.time_ns() // 1_000_000
 
 
 def build_event(
@@ -52,10 +95,12 @@ def build_event(
     payload: dict | None = None,
     artifacts: list[ArtifactRef] | None = None,
     trace_id: str | None = None,
+    event_id: str | None = None,
+    ts: int | None = None,
 ) -> Event:
     return Event(
-        eventId=str(uuid4()),
-        ts=now_ms(),
+        eventId=event_id or uuid4().hex,
+        ts=time.time_ns() // 1_000_000 if ts is None else ts,
         topicId=topic_id,
         runId=run_id,
         agentId=agent_id,
@@ -68,13 +113,287 @@ def build_event(
     )
 
 
+def build_event_unchecked(
+    *,
+    topic_id: str,
+    run_id: str,
+    agent_id: AgentId,
+    kind: EventKind,
+    severity: Severity,
+    summary: str,
+    payload: dict | None = None,
+    trace_id: str | None = None,
+    event_id: str | None = None,
+    ts: int | None = None,
+) -> Event:
+    # Only for the runner's constant events: literal summaries and module-level
+    # payloads that are valid by construction. Anything carrying runtime or
+    # caller-supplied data goes through build_event.
+    return Event.model_construct(
+        eventId=event_id or uuid4().hex,
+        ts=time.time_ns() // 1_000_000 if ts is None else ts,
+        topicId=topic_id,
+        runId=run_id,
+        agentId=agent_id,
+        kind=kind,
+        severity=severity,
+        summary=summary,
+        payload=payload,
+        artifacts=None,
+        traceId=trace_id,
+    )
+
+
+def _wrap_upstream(topic_anchor: str, tag: str, body: str) -> str:
+    # Single join instead of chained f-string pieces; bodies can be large.
+    return "".join((topic_anchor, "\n\n<", tag, ">\n", body, "\n</", tag, ">"))
+
+
+def _fallback_results_json(*, topic_id: str, topic_title: str, run_id: str) -> dict[str, Any]:
+    return {
+        "topicId": topic_id,
+        "topicTitle": topic_title,
+        "runId": run_id,
+        "metrics": dict(_FALLBACK_METRICS),
+        "notes": "Fallback result content",
+        "next_actions": ["scale data", "run ablation", "track cost/quality"],
+    }
+
+
+_FALLBACK_MISSING_TEXT = {"zh": "未提供", "en": "N/A"}
+
+_REVIEW_FALLBACK_TEMPLATES = {
+    "zh": (
+        "# {topic_title} 文献综述（回退）\n\n"
+        "## 主题对齐\n"
+        "- 研究主题：{topic_title}\n"
+        "- 场景描述：{topic_description}\n"
+        "- 核心目标：{topic_objective}\n\n"
+        "## 现状观察\n"
+        "- 该方向常见方案包括检索增强、知识蒸馏与评估闭环。\n"
+        "- 实际落地中最常见瓶颈是数据质量与评测口径不一致。\n"
+        "- 需要明确在线约束，避免实验结果不可复现。\n\n"
+        "## 方法对比\n"
+        "- 规则驱动：可控但覆盖有限。\n"
+        "- 端到端模型：潜力高但解释性较弱。\n"
+        "- 混合式架构：在稳定性与性能间更平衡。\n\n"
+        "## 后续建议\n"
+        "- 进入 ideation 阶段，先做 2-3 个可执行方案。\n"
+        "- 同步定义实验指标、成本预算、失败回退机制。\n"
+        "- 保留与主题目标直接相关的约束，减少泛化描述。\n"
+    ),
+    "en": (
+        "# Literature Survey for {topic_title} (Fallback)\n\n"
+        "## Topic Alignment\n"
+        "- Topic: {topic_title}\n"
+        "- Description: {topic_description}\n"
+        "- Objective: {topic_objective}\n\n"
+        "## Current Landscape\n"
+        "- Typical directions include retrieval augmentation, distillation, and closed-loop evaluation.\n"
+        "- Common production bottleneck is mismatch between data quality and evaluation protocol.\n"
+        "- Online constraints must be explicit to keep experiments reproducible.\n\n"
+        "## Method Comparison\n"
+        "- Rule-driven: controllable but narrow coverage.\n"
+        "- End-to-end: high performance ceiling but weaker interpretability.\n"
+        "- Hybrid: balanced trade-off between reliability and performance.\n\n"
+        "## Next Actions\n"
+        "- Move to ideation with 2-3 executable proposals.\n"
+        "- Define metrics, budget, and rollback policy together.\n"
+        "- Keep constraints tightly bound to the topic objective.\n"
+    ),
+}
+
+_IDEAS_FALLBACK_TEMPLATES = {
+    "zh": (
+        "# {topic_title} 方案构思（回退）\n\n"
+        "## 主题对齐\n"
+        "- 描述约束：{topic_description}\n"
+        "- 目标约束：{topic_objective}\n"
+        "- 下述方案均围绕该主题目标设计，不做泛化扩展。\n\n"
+        "## 方案 A：检索增强 + 质量门控\n"
+        "- 假设：提升检索相关性能显著提高回答可靠性。\n"
+        "- 执行：引入 query rewrite、rerank、低分拒答策略。\n"
+        "- 指标：Hit@k、回答准确率、拒答正确率。\n\n"
+        "## 方案 B：多路径推理 + 置信度路由\n"
+        "- 假设：按任务难度路由可提升总体稳定性。\n"
+        "- 执行：轻量路径与重路径并行，按置信度选择。\n"
+        "- 指标：端到端延迟、失败率、复杂问题成功率。\n\n"
+        "## 方案 C：反馈闭环优化\n"
+        "- 假设：将失败样本回灌可持续提升表现。\n"
+        "- 执行：沉淀 error cases，定期离线再评估。\n"
+        "- 指标：迭代增益、回归率、维护成本。\n"
+    ),
+    "en": (
+        "# Research Ideas for {topic_title} (Fallback)\n\n"
+        "## Topic Alignment\n"
+        "- Description constraints: {topic_description}\n"
+        "- Objective constraints: {topic_objective}\n"
+        "- All ideas below are scoped to this topic and objective.\n\n"
+        "## Idea A: Retrieval Augmentation + Quality Gates\n"
+        "- Hypothesis: improving retrieval relevance lifts answer reliability.\n"
+        "- Plan: add query rewrite, rerank, and low-score abstention.\n"
+        "- Metrics: Hit@k, answer accuracy, abstention precision.\n\n"
+        "## Idea B: Multi-path Reasoning + Confidence Routing\n"
+        "- Hypothesis: route-by-difficulty improves stability.\n"
+        "- Plan: lightweight and heavy paths, selected by confidence.\n"
+        "- Metrics: latency, failure rate, hard-case success rate.\n\n"
+        "## Idea C: Feedback-Driven Iteration\n"
+        "- Hypothesis: replaying failure cases yields compounding gains.\n"
+        "- Plan: collect error cases and run periodic offline reevaluation.\n"
+        "- Metrics: iteration uplift, regression rate, maintenance overhead.\n"
+    ),
+}
+
+_RESULT_REPORT_FALLBACK_TEMPLATES = {
+    "zh": (
+        "# {topic_title} 实验结果报告（回退）\n\n"
+        "## 主题对齐\n"
+        "- 场景描述：{topic_description}\n"
+        "- 目标说明：{topic_objective}\n"
+        "- 本报告仅围绕主题目标解释实验结果。\n\n"
+        "## 关键观察\n"
+        "- 检索增强路线在稳定性上提升明显。\n"
+        "- 置信度路由降低了高难样本的失败率。\n"
+        "- 反馈闭环对迭代增益有正向作用。\n\n"
+        "## 指标解读\n"
+        "- Accuracy: {accuracy}\n"
+        "- F1: {f1}\n"
+        "- Robustness: {robustness}\n"
+        "- 指标表明当前方案可进入下一轮优化。\n\n"
+        "## 风险与下一步\n"
+        "- 风险：数据分布漂移可能导致线上回落。\n"
+        "- 风险：复杂路由策略增加维护成本。\n"
+        "- 下一步：扩样本、做消融、补充成本收益分析。\n"
+    ),
+    "en": (
+        "# Experiment Result Report for {topic_title} (Fallback)\n\n"
+        "## Topic Alignment\n"
+        "- Description: {topic_description}\n"
+        "- Objective: {topic_objective}\n"
+        "- This report remains scoped to the topic constraints.\n\n"
+        "## Key Observations\n"
+        "- Retrieval-augmented setup improved reliability.\n"
+        "- Confidence routing reduced failure rate on hard cases.\n"
+        "- Feedback loop contributed to iterative gains.\n\n"
+        "## Metrics Interpretation\n"
+        "- Accuracy: {accuracy}\n"
+        "- F1: {f1}\n"
+        "- Robustness: {robustness}\n"
+        "- Signals are positive for the next optimization cycle.\n\n"
+        "## Risks and Next Steps\n"
+        "- Risk: distribution shift can hurt online quality.\n"
+        "- Risk: more complex routing increases maintenance burden.\n"
+        "- Next: scale data, run ablations, add cost-benefit analysis.\n"
+    ),
+}
+
+
+def _render_fallback(
+    templates: dict[str, str],
+    *,
+    language: str,
+    topic_title: str,
+    topic_description: str,
+    topic_objective: str,
+    **extra: object,
+) -> str:
+    lang = "zh" if language == "zh" else "en"
+    missing = _FALLBACK_MISSING_TEXT[lang]
+    return templates[lang].format_map(
+        {
+            "topic_title": topic_title,
+            "topic_description": topic_description or missing,
+            "topic_objective": topic_objective or missing,
+            **extra,
+        }
+    )
+
+
+@lru_cache(maxsize=128)
+def _fallback_review_markdown(
+    *,
+    language: str,
+    topic_title: str,
+    topic_description: str,
+    topic_objective: str,
+) -> str:
+    return _render_fallback(
+        _REVIEW_FALLBACK_TEMPLATES,
+        language=language,
+        topic_title=topic_title,
+        topic_description=topic_description,
+        topic_objective=topic_objective,
+    )
+
+
+@lru_cache(maxsize=128)
+def _fallback_ideas_markdown(
+    *,
+    language: str,
+    topic_title: str,
+    topic_description: str,
+    topic_objective: str,
+) -> str:
+    return _render_fallback(
+        _IDEAS_FALLBACK_TEMPLATES,
+        language=language,
+        topic_title=topic_title,
+        topic_description=topic_description,
+        topic_objective=topic_objective,
+    )
+
+
+@lru_cache(maxsize=128)
+def _fallback_result_report_markdown(
+    *,
+    language: str,
+    topic_title: str,
+    topic_description: str,
+    topic_objective: str,
+    accuracy: object,
+    f1: object,
+    robustness: object,
+) -> str:
+    return _render_fallback(
+        _RESULT_REPORT_FALLBACK_TEMPLATES,
+        language=language,
+        topic_title=topic_title,
+        topic_description=topic_description,
+        topic_objective=topic_objective,
+        accuracy=accuracy,
+        f1=f1,
+        robustness=robustness,
+    )
+
+
+_FEEDBACK_FALLBACK_MARKDOWN = {
+    "zh": (
+        "## Feedback Plan (Fallback)\n"
+        "- Keep effective paths\n"
+        "- Correct failed points\n"
+        "- Define next validation metrics\n"
+    ),
+    "en": (
+        "## Feedback Plan (Fallback)\n"
+        "- Keep effective paths\n"
+        "- Correct failed points\n"
+        "- Define next validation metrics\n"
+    ),
+}
+
+
+def _fallback_feedback_markdown(language: str) -> str:
+    return _FEEDBACK_FALLBACK_MARKDOWN["zh" if language == "zh" else "en"]
+
+
 class FakePipelineRunner:
     def __init__(self) -> None:
-        self._step_sleep = 0.8
-
-    @staticmethod
-    def _pick_by_lang(language: str, zh_text: str, en_text: str) -> str:
-        return zh_text if language == "zh" else en_text
+        self._step_sleep = max(float(get_settings().runner_step_sleep_seconds), 0.0)
+        self._pending_events: dict[str, list[Event]] = defaultdict(list)
+        self._event_queue: asyncio.Queue[list[Event]] | None = None
+        self._event_writer: asyncio.Task[None] | None = None
+        self._event_write_errors: dict[str, Exception] = {}
+        self._missing_key_warned = False
 
     @staticmethod
     def _safe_text(value: object, fallback: str = "") -> str:
@@ -200,19 +519,7 @@ class FakePipelineRunner:
         if metrics:
             payload["metrics"] = metrics
 
-        if status == "success":
-            artifact_summary = ", ".join(name for name in artifact_names if isinstance(name, str) and name.strip())
-            assistant_text = (
-                f"{module_runtime.module} 输出已生成"
-                + (f"：{artifact_summary}" if artifact_summary else "")
-            )
-            await history_title_service.maybe_generate_for_run_output(
-                topic_id=topic_id,
-                run_id=run_id,
-                assistant_text=assistant_text,
-            )
-
-        await self._emit(
+        emit_finished = self._emit(
             build_event(
                 topic_id=topic_id,
                 run_id=run_id,
@@ -224,6 +531,25 @@ class FakePipelineRunner:
                 trace_id=trace_id,
             )
         )
+        if status != "success":
+            await emit_finished
+            return
+
+        artifact_summary = ", ".join(name for name in artifact_names if isinstance(name, str) and name.strip())
+        assistant_text = (
+            f"{module_runtime.module} 输出已生成"
+            + (f"：{artifact_summary}" if artifact_summary else "")
+        )
+        # The history title (possibly an LLM call) and the module_finished event
+        # are independent; the title service swallows its own errors.
+        await asyncio.gather(
+            history_title_service.maybe_generate_for_run_output(
+                topic_id=topic_id,
+                run_id=run_id,
+                assistant_text=assistant_text,
+            ),
+            emit_finished,
+        )
 
     async def _emit_module_skipped(
         self,
@@ -261,26 +587,44 @@ class FakePipelineRunner:
         exc: Exception,
     ) -> None:
         await self._emit(
-            build_event(
+            self._module_failed_event(
                 topic_id=topic_id,
                 run_id=run_id,
-                agent_id=self._module_agent(module_runtime.module),
-                kind=EventKind.module_failed,
-                severity=Severity.error,
-                summary=f"{module_runtime.module} module failed",
-                payload={
-                    "runId": run_id,
-                    "module": module_runtime.module,
-                    "error": {
-                        "message": str(exc) or exc.__class__.__name__,
-                        "code": exc.__class__.__name__,
-                    },
-                    "retryable": False,
-                },
                 trace_id=trace_id,
+                module_runtime=module_runtime,
+                exc=exc,
             )
         )
 
+    @classmethod
+    def _module_failed_event(
+        cls,
+        *,
+        topic_id: str,
+        run_id: str,
+        trace_id: str,
+        module_runtime: ModuleRuntime,
+        exc: Exception,
+    ) -> Event:
+        return build_event(
+            topic_id=topic_id,
+            run_id=run_id,
+            agent_id=cls._module_agent(module_runtime.module),
+            kind=EventKind.module_failed,
+            severity=Severity.error,
+            summary=f"{module_runtime.module} module failed",
+            payload={
+                "runId": run_id,
+                "module": module_runtime.module,
+                "error": {
+                    "message": str(exc) or exc.__class__.__name__,
+                    "code": exc.__class__.__name__,
+                },
+                "retryable": False,
+            },
+            trace_id=trace_id,
+        )
+
     async def _wait_if_human_required(
         self,
         *,
@@ -327,6 +671,7 @@ class FakePipelineRunner:
             )
         )
 
+        await self._flush_events(run_id)
         decision = await approval_manager.wait_for_decision(run_id, module_runtime.module)
         await store.update_run_runtime(
             run_id,
@@ -566,15 +911,10 @@ class FakePipelineRunner:
             run_id=run_id,
             agent_id=agent_id,
             trace_id=trace_id,
-            system_policy="You are a planning module that decomposes agent work into executable subtasks.",
-            upstream_content=(
-                f"{topic_anchor}\n\n"
-                "<upstream_reference>\n"
-                f"{upstream_ref}\n"
-                "</upstream_reference>"
-            ),
+            system_policy=_PLANNER_SYSTEM_POLICY,
+            upstream_content=_wrap_upstream(topic_anchor, "upstream_reference", upstream_ref),
             final_task=planner_task,
-            fallback_content={"subtasks": fallback_subtasks},
+            fallback_factory=lambda: {"subtasks": fallback_subtasks},
             llm_model=llm_model,
             max_tokens=700,
         )
@@ -588,8 +928,94 @@ class FakePipelineRunner:
         return normalized
 
     async def _emit(self, event: Event) -> None:
-        await store.add_event(event)
-        await event_bus.publish(event.topicId, event)
+        # Publish right away; persistence is batched per run and handed to the
+        # background writer at agent status transitions (see _flush_events).
+        pending = self._pending_events[event.runId]
+        pending.append(event)
+        event_bus.publish_nowait(event.topicId, event)
+        if len(pending) >= _EVENT_FLUSH_THRESHOLD:
+            await self._flush_events(event.runId)
+
+    async def _flush_events(self, run_id: str, *, wait: bool = False) -> None:
+        """Hand the run's buffered events to the background writer.
+
+        With ``wait=True`` (or once the writer falls behind) this also waits
+        until everything queued so far has been written. A wait raises the
+        error for any of the run's events the writer gave up on.
+        """
+        pending = self._pending_events.pop(run_id, None)
+        queue = self._ensure_event_writer()
+        if pending:
+            queue.put_nowait(pending)
+        if wait or queue.qsize() >= _EVENT_WRITE_BACKLOG_LIMIT:
+            await queue.join()
+        if wait:
+            error = self._event_write_errors.pop(run_id, None)
+            if error is not None:
+                raise error
+
+    async def drain_events(self) -> None:
+        """Write every buffered event for all runs; used on application shutdown."""
+        if not self._pending_events and self._event_queue is None:
+            return
+        queue = self._ensure_event_writer()
+        for run_id in list(self._pending_events):
+            pending = self._pending_events.pop(run_id, None)
+            if pending:
+                queue.put_nowait(pending)
+        await queue.join()
+
+        failed_runs = sorted(self._event_write_errors)
+        self._event_write_errors.clear()
+        if failed_runs:
+            raise RuntimeError(f"Events for {len(failed_runs)} run(s) were not persisted: {', '.join(failed_runs)}")
+
+    def _ensure_event_writer(self) -> asyncio.Queue[list[Event]]:
+        queue = self._event_queue
+        if queue is None or self._event_writer is None or self._event_writer.done():
+            queue = self._event_queue = asyncio.Queue()
+            self._event_writer = asyncio.get_running_loop().create_task(self._event_writer_loop(queue))
+        return queue
+
+    async def _event_writer_loop(self, queue: asyncio.Queue[list[Event]]) -> None:
+        while True:
+            batch = await queue.get()
+            taken = 1
+            # Coalesce whatever else is already queued into the same transaction.
+            while len(batch) < _EVENT_WRITE_BATCH_LIMIT and not queue.empty():
+                batch = batch + queue.get_nowait()
+                taken += 1
+            try:
+                await self._write_event_batch(batch)
+            finally:
+                for _ in range(taken):
+                    queue.task_done()
+
+    async def _write_event_batch(self, batch: list[Event]) -> None:
+        for delay in (*_EVENT_WRITE_RETRY_DELAYS, None):
+            try:
+                await store.add_events(batch)
+                return
+            except Exception as exc:
+                if delay is None:
+                    logger.exception("Failed to persist %s buffered event(s)", len(batch))
+                    for event in batch:
+                        self._event_write_errors.setdefault(event.runId, exc)
+                    return
+                logger.warning(
+                    "Persisting %s buffered event(s) failed; retrying in %.1fs",
+                    len(batch),
+                    delay,
+                    exc_info=True,
+                )
+                await asyncio.sleep(delay)
+
+    async def _with_step_padding(self, work: Awaitable[T]) -> T:
+        # Demo pacing runs alongside the LLM call instead of in front of it.
+        if self._step_sleep <= 0:
+            return await work
+        result, _ = await asyncio.gather(work, asyncio.sleep(self._step_sleep))
+        return result
 
     async def _create_artifact(
         self,
@@ -598,7 +1024,7 @@ class FakePipelineRunner:
         run_id: str,
         name: str,
         content_type: str,
-        content: str | dict,
+        content: str | bytes | dict,
     ) -> ArtifactRef:
         return await store.create_artifact(
             topic_id=topic_id,
@@ -608,6 +1034,25 @@ class FakePipelineRunner:
             content=content,
         )
 
+    async def _publish_artifacts(
+        self,
+        *,
+        topic_id: str,
+        run_id: str,
+        files: list[tuple[str, str, str | bytes | dict]],
+        build_events: Callable[[list[ArtifactRef]], list[Event]],
+    ) -> list[ArtifactRef]:
+        # Artifact rows plus their artifact_created/completed events are one
+        # store write; only the broadcast happens afterwards.
+        artifacts, events = await store.create_artifacts_with_events(
+            topic_id=topic_id,
+            run_id=run_id,
+            files=files,
+            build_events=build_events,
+        )
+        event_bus.publish_many_nowait(topic_id, events)
+        return artifacts
+
     async def _update_agent(
         self,
         *,
@@ -619,27 +1064,42 @@ class FakePipelineRunner:
         summary: str,
         trace_id: str,
     ) -> None:
-        await store.set_agent_status(
-            topic_id,
+        # Agent state is derived from agent_status_updated events, so the event
+        # is the only write; topic existence is checked when it is persisted.
+        event = self._agent_status_event(
+            topic_id=topic_id,
+            run_id=run_id,
             agent_id=agent_id,
             status=status,
             progress=progress,
-            run_id=run_id,
             summary=summary,
+            trace_id=trace_id,
         )
+        await self._emit(event)
+        if status in _EVENT_FLUSH_STATUSES:
+            await self._flush_events(run_id)
 
-        severity = Severity.error if status == "failed" else Severity.info
-        event = build_event(
+    @staticmethod
+    def _agent_status_event(
+        *,
+        topic_id: str,
+        run_id: str,
+        agent_id: AgentId,
+        status: str,
+        progress: float,
+        summary: str,
+        trace_id: str,
+    ) -> Event:
+        return build_event(
             topic_id=topic_id,
             run_id=run_id,
             agent_id=agent_id,
             kind=EventKind.agent_status_updated,
-            severity=severity,
+            severity=_SEV_ERROR if status == "failed" else _SEV_INFO,
             summary=summary,
             payload={"status": status, "progress": progress},
             trace_id=trace_id,
         )
-        await self._emit(event)
 
     async def _emit_llm_stage(
         self,
@@ -657,7 +1117,7 @@ class FakePipelineRunner:
                 topic_id=topic_id,
                 run_id=run_id,
                 agent_id=agent_id,
-                kind=EventKind.event_emitted,
+                kind=_EVT_EMITTED,
                 severity=severity,
                 summary=summary,
                 payload=payload,
@@ -671,9 +1131,12 @@ class FakePipelineRunner:
         if not text.startswith("```"):
             return text
 
-        lines = text.splitlines()
-        if len(lines) >= 2 and lines[-1].strip() == "```":
-            return "\n".join(lines[1:-1]).strip()
+        # Drop the opening fence line and the closing fence by slicing instead
+        # of splitting the whole response into lines.
+        _, _, rest = text.partition("\n")
+        body, sep, tail = rest.rpartition("```")
+        if sep and not tail.strip():
+            return body.strip()
 
         return text
 
@@ -681,168 +1144,40 @@ class FakePipelineRunner:
     def _parse_json_payload(cls, content: str) -> dict | None:
         raw = cls._strip_markdown_fence(content)
         try:
-            parsed = json.loads(raw)
+            parsed = json_loads(raw)
             if isinstance(parsed, dict):
                 return parsed
-        except json.JSONDecodeError:
+        except JSONDecodeError:
             pass
 
+        if raw.startswith("{") and raw.endswith("}"):
+            # The brace-trimmed slice would be the same text that just failed.
+            return None
+
         start = raw.find("{")
         end = raw.rfind("}")
         if start == -1 or end <= start:
             return None
 
         try:
-            parsed = json.loads(raw[start : end + 1])
-        except json.JSONDecodeError:
+            parsed = json_loads(raw[start : end + 1])
+        except JSONDecodeError:
             return None
         return parsed if isinstance(parsed, dict) else None
 
-    @staticmethod
-    def _fallback_review_markdown(
-        *,
-        language: str,
-        topic_title: str,
-        topic_description: str,
-        topic_objective: str,
-    ) -> str:
-        if language == "zh":
-            return (
-                f"# {topic_title} 文献综述（回退）\n\n"
-                "## 主题对齐\n"
-                f"- 研究主题：{topic_title}\n"
-                f"- 场景描述：{topic_description or '未提供'}\n"
-                f"- 核心目标：{topic_objective or '未提供'}\n\n"
-                "## 现状观察\n"
-                "- 该方向常见方案包括检索增强、知识蒸馏与评估闭环。\n"
-                "- 实际落地中最常见瓶颈是数据质量与评测口径不一致。\n"
-                "- 需要明确在线约束，避免实验结果不可复现。\n\n"
-                "## 方法对比\n"
-                "- 规则驱动：可控但覆盖有限。\n"
-                "- 端到端模型：潜力高但解释性较弱。\n"
-                "- 混合式架构：在稳定性与性能间更平衡。\n\n"
-                "## 后续建议\n"
-                "- 进入 ideation 阶段，先做 2-3 个可执行方案。\n"
-                "- 同步定义实验指标、成本预算、失败回退机制。\n"
-                "- 保留与主题目标直接相关的约束，减少泛化描述。\n"
-            )
-        return (
-            f"# Literature Survey for {topic_title} (Fallback)\n\n"
-            "## Topic Alignment\n"
-            f"- Topic: {topic_title}\n"
-            f"- Description: {topic_description or 'N/A'}\n"
-            f"- Objective: {topic_objective or 'N/A'}\n\n"
-            "## Current Landscape\n"
-            "- Typical directions include retrieval augmentation, distillation, and closed-loop evaluation.\n"
-            "- Common production bottleneck is mismatch between data quality and evaluation protocol.\n"
-            "- Online constraints must be explicit to keep experiments reproducible.\n\n"
-            "## Method Comparison\n"
-            "- Rule-driven: controllable but narrow coverage.\n"
-            "- End-to-end: high performance ceiling but weaker interpretability.\n"
-            "- Hybrid: balanced trade-off between reliability and performance.\n\n"
-            "## Next Actions\n"
-            "- Move to ideation with 2-3 executable proposals.\n"
-            "- Define metrics, budget, and rollback policy together.\n"
-            "- Keep constraints tightly bound to the topic objective.\n"
-        )
-
-    @staticmethod
-    def _fallback_ideas_markdown(
-        *,
-        language: str,
-        topic_title: str,
-        topic_description: str,
-        topic_objective: str,
-    ) -> str:
-        if language == "zh":
-            return (
-                f"# {topic_title} 方案构思（回退）\n\n"
-                "## 主题对齐\n"
-                f"- 描述约束：{topic_description or '未提供'}\n"
-                f"- 目标约束：{topic_objective or '未提供'}\n"
-                "- 下述方案均围绕该主题目标设计，不做泛化扩展。\n\n"
-                "## 方案 A：检索增强 + 质量门控\n"
-                "- 假设：提升检索相关性能显著提高回答可靠性。\n"
-                "- 执行：引入 query rewrite、rerank、低分拒答策略。\n"
-                "- 指标：Hit@k、回答准确率、拒答正确率。\n\n"
-                "## 方案 B：多路径推理 + 置信度路由\n"
-                "- 假设：按任务难度路由可提升总体稳定性。\n"
-                "- 执行：轻量路径与重路径并行，按置信度选择。\n"
-                "- 指标：端到端延迟、失败率、复杂问题成功率。\n\n"
-                "## 方案 C：反馈闭环优化\n"
-                "- 假设：将失败样本回灌可持续提升表现。\n"
-                "- 执行：沉淀 error cases，定期离线再评估。\n"
-                "- 指标：迭代增益、回归率、维护成本。\n"
-            )
-        return (
-            f"# Research Ideas for {topic_title} (Fallback)\n\n"
-            "## Topic Alignment\n"
-            f"- Description constraints: {topic_description or 'N/A'}\n"
-            f"- Objective constraints: {topic_objective or 'N/A'}\n"
-            "- All ideas below are scoped to this topic and objective.\n\n"
-            "## Idea A: Retrieval Augmentation + Quality Gates\n"
-            "- Hypothesis: improving retrieval relevance lifts answer reliability.\n"
-            "- Plan: add query rewrite, rerank, and low-score abstention.\n"
-            "- Metrics: Hit@k, answer accuracy, abstention precision.\n\n"
-            "## Idea B: Multi-path Reasoning + Confidence Routing\n"
-            "- Hypothesis: route-by-difficulty improves stability.\n"
-            "- Plan: lightweight and heavy paths, selected by confidence.\n"
-            "- Metrics: latency, failure rate, hard-case success rate.\n\n"
-            "## Idea C: Feedback-Driven Iteration\n"
-            "- Hypothesis: replaying failure cases yields compounding gains.\n"
-            "- Plan: collect error cases and run periodic offline reevaluation.\n"
-            "- Metrics: iteration uplift, regression rate, maintenance overhead.\n"
-        )
-
-    @staticmethod
-    def _fallback_result_report_markdown(
-        *,
-        language: str,
-        topic_title: str,
-        topic_description: str,
-        topic_objective: str,
-        metrics: dict,
-    ) -> str:
-        if language == "zh":
-            return (
-                f"# {topic_title} 实验结果报告（回退）\n\n"
-                "## 主题对齐\n"
-                f"- 场景描述：{topic_description or '未提供'}\n"
-                f"- 目标说明：{topic_objective or '未提供'}\n"
-                "- 本报告仅围绕主题目标解释实验结果。\n\n"
-                "## 关键观察\n"
-                "- 检索增强路线在稳定性上提升明显。\n"
-                "- 置信度路由降低了高难样本的失败率。\n"
-                "- 反馈闭环对迭代增益有正向作用。\n\n"
-                "## 指标解读\n"
-                f"- Accuracy: {metrics.get('accuracy', 'n/a')}\n"
-                f"- F1: {metrics.get('f1', 'n/a')}\n"
-                f"- Robustness: {metrics.get('robustness', 'n/a')}\n"
-                "- 指标表明当前方案可进入下一轮优化。\n\n"
-                "## 风险与下一步\n"
-                "- 风险：数据分布漂移可能导致线上回落。\n"
-                "- 风险：复杂路由策略增加维护成本。\n"
-                "- 下一步：扩样本、做消融、补充成本收益分析。\n"
-            )
-        return (
-            f"# Experiment Result Report for {topic_title} (Fallback)\n\n"
-            "## Topic Alignment\n"
-            f"- Description: {topic_description or 'N/A'}\n"
-            f"- Objective: {topic_objective or 'N/A'}\n"
-            "- This report remains scoped to the topic constraints.\n\n"
-            "## Key Observations\n"
-            "- Retrieval-augmented setup improved reliability.\n"
-            "- Confidence routing reduced failure rate on hard cases.\n"
-            "- Feedback loop contributed to iterative gains.\n\n"
-            "## Metrics Interpretation\n"
-            f"- Accuracy: {metrics.get('accuracy', 'n/a')}\n"
-            f"- F1: {metrics.get('f1', 'n/a')}\n"
-            f"- Robustness: {metrics.get('robustness', 'n/a')}\n"
-            "- Signals are positive for the next optimization cycle.\n\n"
-            "## Risks and Next Steps\n"
-            "- Risk: distribution shift can hurt online quality.\n"
-            "- Risk: more complex routing increases maintenance burden.\n"
-            "- Next: scale data, run ablations, add cost-benefit analysis.\n"
+    def _log_missing_key(self, kind: str, *, topic_id: str, run_id: str, agent_id: AgentId) -> None:
+        # A missing key is a deployment setting, not a per-call failure: warn
+        # once per process and keep later occurrences at debug level.
+        level = logging.DEBUG if self._missing_key_warned else logging.WARNING
+        self._missing_key_warned = True
+        logger.log(
+            level,
+            "DeepSeek key missing; fallback %s used (topic=%s run=%s agent=%s)",
+            kind,
+            topic_id,
+            run_id,
+            agent_id.value,
+            extra={"topic_id": topic_id, "run_id": run_id, "agent_id": agent_id.value},
         )
 
     async def _generate_text_content(
@@ -855,20 +1190,18 @@ class FakePipelineRunner:
         system_policy: str,
         upstream_content: str,
         final_task: str,
-        fallback_content: str,
+        fallback_factory: Callable[[], str],
         llm_model: str | None = None,
         max_tokens: int | None = None,
     ) -> str:
-        with SessionLocal() as db:
-            messages = await build_agent_prompt_context(
-                db=db,
-                topic_id=topic_id,
-                run_id=run_id,
-                agent_id=agent_id.value,
-                system_policy=system_policy,
-                upstream_content=upstream_content,
-                final_task=final_task,
-            )
+        messages = await build_agent_prompt_context(
+            topic_id=topic_id,
+            run_id=run_id,
+            agent_id=agent_id.value,
+            system_policy=system_policy,
+            upstream_content=upstream_content,
+            final_task=final_task,
+        )
 
         await self._emit_llm_stage(
             topic_id=topic_id,
@@ -885,12 +1218,7 @@ class FakePipelineRunner:
         )
 
         if not deepseek_client.is_configured:
-            logger.warning(
-                "DeepSeek key missing; fallback text used (topic=%s run=%s agent=%s)",
-                topic_id,
-                run_id,
-                agent_id.value,
-            )
+            self._log_missing_key("text", topic_id=topic_id, run_id=run_id, agent_id=agent_id)
             await self._emit_llm_stage(
                 topic_id=topic_id,
                 run_id=run_id,
@@ -898,10 +1226,12 @@ class FakePipelineRunner:
                 trace_id=trace_id,
                 summary="DEEPSEEK_API_KEY is missing, fallback content used",
                 severity=Severity.warn,
-                payload={"provider": "deepseek", "fallback": True},
+                payload=_PAYLOAD_LLM_FALLBACK,
             )
-            return fallback_content
+            return fallback_factory()
 
+        # Persist what the run has emitted so far before idling on the network.
+        await self._flush_events(run_id)
         try:
             response = await deepseek_client.chat(messages, model=llm_model, max_tokens=max_tokens)
         except DeepSeekClientError as exc:
@@ -912,6 +1242,7 @@ class FakePipelineRunner:
                 run_id,
                 agent_id.value,
                 error_payload["error"],
+                extra={"topic_id": topic_id, "run_id": run_id, "agent_id": agent_id.value},
             )
             await self._emit_llm_stage(
                 topic_id=topic_id,
@@ -922,7 +1253,7 @@ class FakePipelineRunner:
                 severity=Severity.error,
                 payload={"provider": "deepseek", "fallback": True, **error_payload},
             )
-            return fallback_content
+            return fallback_factory()
 
         normalized = self._strip_markdown_fence(response).strip()
         if not normalized:
@@ -933,9 +1264,9 @@ class FakePipelineRunner:
                 trace_id=trace_id,
                 summary="DeepSeek returned empty content, fallback content used",
                 severity=Severity.warn,
-                payload={"provider": "deepseek", "fallback": True},
+                payload=_PAYLOAD_LLM_FALLBACK,
             )
-            return fallback_content
+            return fallback_factory()
 
         await self._emit_llm_stage(
             topic_id=topic_id,
@@ -943,7 +1274,7 @@ class FakePipelineRunner:
             agent_id=agent_id,
             trace_id=trace_id,
             summary=f"{agent_id.value} received DeepSeek response",
-            payload={"provider": "deepseek", "fallback": False},
+            payload=_PAYLOAD_LLM_OK,
         )
         return normalized
 
@@ -957,20 +1288,18 @@ class FakePipelineRunner:
         system_policy: str,
         upstream_content: str,
         final_task: str,
-        fallback_content: dict,
+        fallback_factory: Callable[[], dict],
         llm_model: str | None = None,
         max_tokens: int | None = None,
     ) -> dict:
-        with SessionLocal() as db:
-            messages = await build_agent_prompt_context(
-                db=db,
-                topic_id=topic_id,
-                run_id=run_id,
-                agent_id=agent_id.value,
-                system_policy=system_policy,
-                upstream_content=upstream_content,
-                final_task=final_task,
-            )
+        messages = await build_agent_prompt_context(
+            topic_id=topic_id,
+            run_id=run_id,
+            agent_id=agent_id.value,
+            system_policy=system_policy,
+            upstream_content=upstream_content,
+            final_task=final_task,
+        )
 
         await self._emit_llm_stage(
             topic_id=topic_id,
@@ -987,12 +1316,7 @@ class FakePipelineRunner:
         )
 
         if not deepseek_client.is_configured:
-            logger.warning(
-                "DeepSeek key missing; fallback JSON used (topic=%s run=%s agent=%s)",
-                topic_id,
-                run_id,
-                agent_id.value,
-            )
+            self._log_missing_key("JSON", topic_id=topic_id, run_id=run_id, agent_id=agent_id)
             await self._emit_llm_stage(
                 topic_id=topic_id,
                 run_id=run_id,
@@ -1000,10 +1324,12 @@ class FakePipelineRunner:
                 trace_id=trace_id,
                 summary="DEEPSEEK_API_KEY is missing, fallback JSON used",
                 severity=Severity.warn,
-                payload={"provider": "deepseek", "fallback": True},
+                payload=_PAYLOAD_LLM_FALLBACK,
             )
-            return dict(fallback_content)
+            return fallback_factory()
 
+        # Persist what the run has emitted so far before idling on the network.
+        await self._flush_events(run_id)
         try:
             response = await deepseek_client.chat(messages, model=llm_model, max_tokens=max_tokens)
         except DeepSeekClientError as exc:
@@ -1014,6 +1340,7 @@ class FakePipelineRunner:
                 run_id,
                 agent_id.value,
                 error_payload["error"],
+                extra={"topic_id": topic_id, "run_id": run_id, "agent_id": agent_id.value},
             )
             await self._emit_llm_stage(
                 topic_id=topic_id,
@@ -1024,7 +1351,7 @@ class FakePipelineRunner:
                 severity=Severity.error,
                 payload={"provider": "deepseek", "fallback": True, **error_payload},
             )
-            return dict(fallback_content)
+            return fallback_factory()
 
         parsed = self._parse_json_payload(response)
         if parsed is None:
@@ -1035,9 +1362,9 @@ class FakePipelineRunner:
                 trace_id=trace_id,
                 summary="DeepSeek response is not valid JSON, fallback JSON used",
                 severity=Severity.warn,
-                payload={"provider": "deepseek", "fallback": True},
+                payload=_PAYLOAD_LLM_FALLBACK,
             )
-            return dict(fallback_content)
+            return fallback_factory()
 
         await self._emit_llm_stage(
             topic_id=topic_id,
@@ -1045,12 +1372,12 @@ class FakePipelineRunner:
             agent_id=agent_id,
             trace_id=trace_id,
             summary=f"{agent_id.value} received DeepSeek response",
-            payload={"provider": "deepseek", "fallback": False},
+            payload=_PAYLOAD_LLM_OK,
         )
         return parsed
 
     async def run_pipeline(self, topic_id: str, run_id: str) -> None:
-        trace_id = f"trace-{uuid4()}"
+        trace_id = f"trace-{secrets.token_hex(8)}"
         active_agent = AgentId.review
         active_stage: StageName = "review"
         active_module_runtime: ModuleRuntime | None = None
@@ -1179,8 +1506,8 @@ class FakePipelineRunner:
                     topic_id=topic_id,
                     run_id=run_id,
                     agent_id=AgentId.review,
-                    kind=EventKind.event_emitted,
-                    severity=Severity.info,
+                    kind=_EVT_EMITTED,
+                    severity=_SEV_INFO,
                     summary="run started",
                     payload={
                         "phase": "run_started",
@@ -1199,41 +1526,48 @@ class FakePipelineRunner:
                     trace_id=trace_id,
                     summary="run config invalid, default config applied",
                     severity=Severity.warn,
-                    payload={"fallback": True},
+                    payload=_PAYLOAD_CONFIG_FALLBACK,
                 )
 
             review_runtime = self._build_module_runtime("review", run_config)
             ideation_runtime = self._build_module_runtime("ideation", run_config)
             experiment_runtime = self._build_module_runtime("experiment", run_config)
 
-            survey_content = self._fallback_review_markdown(
+            # Fallback documents are only rendered when a module is skipped or
+            # its LLM call falls back.
+            review_fallback = partial(
+                _fallback_review_markdown,
                 language=preferred_language,
                 topic_title=topic_title,
                 topic_description=topic_description,
                 topic_objective=topic_objective,
             )
-            ideas_content = self._fallback_ideas_markdown(
+            ideas_fallback = partial(
+                _fallback_ideas_markdown,
                 language=preferred_language,
                 topic_title=topic_title,
                 topic_description=topic_description,
                 topic_objective=topic_objective,
             )
-            results_content: dict[str, Any] = {
-                "topicId": topic_id,
-                "topicTitle": topic_title,
-                "runId": run_id,
-                "metrics": {"accuracy": 0.78, "f1": 0.74, "robustness": 0.71},
-                "notes": "Fallback result content",
-                "next_actions": ["scale data", "run ablation", "track cost/quality"],
-            }
-            metrics: dict[str, Any] = dict(results_content["metrics"])
-            result_report_content = self._fallback_result_report_markdown(
+            survey_content: str | None = None
+            ideas_content: str | None = None
+            results_fallback = partial(
+                _fallback_results_json,
+                topic_id=topic_id,
+                topic_title=topic_title,
+                run_id=run_id,
+            )
+            result_report_fallback = partial(
+                _fallback_result_report_markdown,
                 language=preferred_language,
                 topic_title=topic_title,
                 topic_description=topic_description,
                 topic_objective=topic_objective,
-                metrics=metrics,
+                accuracy=_FALLBACK_METRICS["accuracy"],
+                f1=_FALLBACK_METRICS["f1"],
+                robustness=_FALLBACK_METRICS["robustness"],
             )
+            result_report_content = ""
 
             ideation_executed = False
             experiment_executed = False
@@ -1258,59 +1592,57 @@ class FakePipelineRunner:
                         trace_id=trace_id,
                     )
                     await self._emit(
-                        build_event(
+                        build_event_unchecked(
                             topic_id=topic_id,
                             run_id=run_id,
                             agent_id=AgentId.review,
-                            kind=EventKind.event_emitted,
-                            severity=Severity.info,
+                            kind=_EVT_EMITTED,
+                            severity=_SEV_INFO,
                             summary="starting literature review",
-                            payload={"stage": "review"},
+                            payload=_STAGE_PAYLOADS["review"],
                             trace_id=trace_id,
                         )
                     )
-                    await asyncio.sleep(self._step_sleep)
-
-                    survey_content = await self._generate_text_content(
-                        topic_id=topic_id,
-                        run_id=run_id,
-                        agent_id=AgentId.review,
-                        trace_id=trace_id,
-                        system_policy="You are the review agent. Produce a rigorous, topic-grounded literature survey in markdown.",
-                        upstream_content=topic_anchor,
-                        final_task="Generate survey.md using <upstream_reference>.",
-                        fallback_content=survey_content,
-                        llm_model=review_runtime.resolved_model,
-                        max_tokens=1800,
-                    )
-                    survey_artifact = await self._create_artifact(
-                        topic_id=topic_id,
-                        run_id=run_id,
-                        name="survey.md",
-                        content_type="text/markdown",
-                        content=survey_content,
-                    )
-                    await self._emit(
-                        build_event(
+                    survey_content = await self._with_step_padding(
+                        self._generate_text_content(
                             topic_id=topic_id,
                             run_id=run_id,
                             agent_id=AgentId.review,
-                            kind=EventKind.artifact_created,
-                            severity=Severity.info,
-                            summary="review produced survey.md",
-                            payload={"handoffTo": "ideation", "artifactRole": "survey"},
-                            artifacts=[survey_artifact],
                             trace_id=trace_id,
+                            system_policy=_REVIEW_SYSTEM_POLICY,
+                            upstream_content=topic_anchor,
+                            final_task=_REVIEW_FINAL_TASK,
+                            fallback_factory=review_fallback,
+                            llm_model=review_runtime.resolved_model,
+                            max_tokens=1800,
                         )
                     )
-                    await self._update_agent(
+                    await self._publish_artifacts(
                         topic_id=topic_id,
                         run_id=run_id,
-                        agent_id=AgentId.review,
-                        status="completed",
-                        progress=1.0,
-                        summary="review completed",
-                        trace_id=trace_id,
+                        files=[("survey.md", "text/markdown", survey_content)],
+                        build_events=lambda artifacts: [
+                            build_event(
+                                topic_id=topic_id,
+                                run_id=run_id,
+                                agent_id=AgentId.review,
+                                kind=EventKind.artifact_created,
+                                severity=_SEV_INFO,
+                                summary="review produced survey.md",
+                                payload={"handoffTo": "ideation", "artifactRole": "survey"},
+                                artifacts=artifacts,
+                                trace_id=trace_id,
+                            ),
+                            self._agent_status_event(
+                                topic_id=topic_id,
+                                run_id=run_id,
+                                agent_id=AgentId.review,
+                                status="completed",
+                                progress=1.0,
+                                summary="review completed",
+                                trace_id=trace_id,
+                            ),
+                        ],
                     )
                     await self._emit_module_finished(
                         topic_id=topic_id,
@@ -1336,15 +1668,12 @@ class FakePipelineRunner:
                     raise
 
             # ideation module
-            active_agent = AgentId.ideation
+            active_agent = _AGENT_IDEATION
             active_stage = "ideation"
             active_module_runtime = ideation_runtime
-            ideas_upstream = (
-                f"{topic_anchor}\n\n"
-                "<review_survey>\n"
-                f"{survey_content}\n"
-                "</review_survey>"
-            )
+            if survey_content is None:
+                survey_content = review_fallback()
+            ideas_upstream = _wrap_upstream(topic_anchor, "review_survey", survey_content)
             if await prepare_module(
                 ideation_runtime,
                 approval_summary="Ideation module requires approval before generating ideas.md",
@@ -1354,66 +1683,64 @@ class FakePipelineRunner:
                     await self._update_agent(
                         topic_id=topic_id,
                         run_id=run_id,
-                        agent_id=AgentId.ideation,
+                        agent_id=_AGENT_IDEATION,
                         status="running",
                         progress=0.2,
                         summary="ideation running",
                         trace_id=trace_id,
                     )
                     await self._emit(
-                        build_event(
+                        build_event_unchecked(
                             topic_id=topic_id,
                             run_id=run_id,
-                            agent_id=AgentId.ideation,
-                            kind=EventKind.event_emitted,
-                            severity=Severity.info,
+                            agent_id=_AGENT_IDEATION,
+                            kind=_EVT_EMITTED,
+                            severity=_SEV_INFO,
                             summary="generating ideas from survey",
-                            payload={"stage": "ideation"},
+                            payload=_STAGE_PAYLOADS["ideation"],
                             trace_id=trace_id,
                         )
                     )
-                    await asyncio.sleep(self._step_sleep)
-
-                    ideas_content = await self._generate_text_content(
-                        topic_id=topic_id,
-                        run_id=run_id,
-                        agent_id=AgentId.ideation,
-                        trace_id=trace_id,
-                        system_policy="You are the ideation agent. Produce implementation-ready ideas.",
-                        upstream_content=ideas_upstream,
-                        final_task="Generate ideas.md from <upstream_reference>.",
-                        fallback_content=ideas_content,
-                        llm_model=ideation_runtime.resolved_model,
-                        max_tokens=1800,
-                    )
-                    ideas_artifact = await self._create_artifact(
-                        topic_id=topic_id,
-                        run_id=run_id,
-                        name="ideas.md",
-                        content_type="text/markdown",
-                        content=ideas_content,
-                    )
-                    await self._emit(
-                        build_event(
+                    ideas_content = await self._with_step_padding(
+                        self._generate_text_content(
                             topic_id=topic_id,
                             run_id=run_id,
-                            agent_id=AgentId.ideation,
-                            kind=EventKind.artifact_created,
-                            severity=Severity.info,
-                            summary="ideation produced ideas.md",
-                            payload={"handoffTo": "experiment", "artifactRole": "idea"},
-                            artifacts=[ideas_artifact],
+                            agent_id=_AGENT_IDEATION,
                             trace_id=trace_id,
+                            system_policy=_IDEATION_SYSTEM_POLICY,
+                            upstream_content=ideas_upstream,
+                            final_task=_IDEATION_FINAL_TASK,
+                            fallback_factory=ideas_fallback,
+                            llm_model=ideation_runtime.resolved_model,
+                            max_tokens=1800,
                         )
                     )
-                    await self._update_agent(
+                    await self._publish_artifacts(
                         topic_id=topic_id,
                         run_id=run_id,
-                        agent_id=AgentId.ideation,
-                        status="completed",
-                        progress=1.0,
-                        summary="ideation completed",
-                        trace_id=trace_id,
+                        files=[("ideas.md", "text/markdown", ideas_content)],
+                        build_events=lambda artifacts: [
+                            build_event(
+                                topic_id=topic_id,
+                                run_id=run_id,
+                                agent_id=_AGENT_IDEATION,
+                                kind=EventKind.artifact_created,
+                                severity=_SEV_INFO,
+                                summary="ideation produced ideas.md",
+                                payload={"handoffTo": "experiment", "artifactRole": "idea"},
+                                artifacts=artifacts,
+                                trace_id=trace_id,
+                            ),
+                            self._agent_status_event(
+                                topic_id=topic_id,
+                                run_id=run_id,
+                                agent_id=_AGENT_IDEATION,
+                                status="completed",
+                                progress=1.0,
+                                summary="ideation completed",
+                                trace_id=trace_id,
+                            ),
+                        ],
                     )
                     await self._emit_module_finished(
                         topic_id=topic_id,
@@ -1443,12 +1770,9 @@ class FakePipelineRunner:
             active_agent = AgentId.experiment
             active_stage = "experiment"
             active_module_runtime = experiment_runtime
-            experiment_upstream = (
-                f"{topic_anchor}\n\n"
-                "<ideas_input>\n"
-                f"{ideas_content}\n"
-                "</ideas_input>"
-            )
+            if ideas_content is None:
+                ideas_content = ideas_fallback()
+            experiment_upstream = _wrap_upstream(topic_anchor, "ideas_input", ideas_content)
             if await prepare_module(
                 experiment_runtime,
                 approval_summary="Experiment module requires approval before execution",
@@ -1465,110 +1789,99 @@ class FakePipelineRunner:
                         trace_id=trace_id,
                     )
                     await self._emit(
-                        build_event(
+                        build_event_unchecked(
                             topic_id=topic_id,
                             run_id=run_id,
                             agent_id=AgentId.experiment,
-                            kind=EventKind.event_emitted,
-                            severity=Severity.info,
+                            kind=_EVT_EMITTED,
+                            severity=_SEV_INFO,
                             summary="running experiments for idea",
-                            payload={"stage": "experiment"},
+                            payload=_STAGE_PAYLOADS["experiment"],
                             trace_id=trace_id,
                         )
                     )
-                    await asyncio.sleep(self._step_sleep)
                     await self._emit(
-                        build_event(
+                        build_event_unchecked(
                             topic_id=topic_id,
                             run_id=run_id,
                             agent_id=AgentId.experiment,
-                            kind=EventKind.event_emitted,
-                            severity=Severity.error,
+                            kind=_EVT_EMITTED,
+                            severity=_SEV_ERROR,
                             summary="experiment encountered temporary failure, retrying",
-                            payload={"errorCode": "SIM_TEMP_FAILURE", "retryable": True},
+                            payload=_PAYLOAD_SIM_TEMP_FAILURE,
                             trace_id=trace_id,
                         )
                     )
 
-                    results_content = await self._generate_json_content(
-                        topic_id=topic_id,
-                        run_id=run_id,
-                        agent_id=AgentId.experiment,
-                        trace_id=trace_id,
-                        system_policy="You are the experiment agent. Return strict JSON only.",
-                        upstream_content=experiment_upstream,
-                        final_task="Generate strict JSON results from <upstream_reference>.",
-                        fallback_content=results_content,
-                        llm_model=experiment_runtime.resolved_model,
-                        max_tokens=1200,
+                    results_content: dict[str, Any] = await self._with_step_padding(
+                        self._generate_json_content(
+                            topic_id=topic_id,
+                            run_id=run_id,
+                            agent_id=AgentId.experiment,
+                            trace_id=trace_id,
+                            system_policy=_EXPERIMENT_SYSTEM_POLICY,
+                            upstream_content=experiment_upstream,
+                            final_task=_EXPERIMENT_FINAL_TASK,
+                            fallback_factory=results_fallback,
+                            llm_model=experiment_runtime.resolved_model,
+                            max_tokens=1200,
+                        )
                     )
                     metrics = results_content.get("metrics") if isinstance(results_content.get("metrics"), dict) else {}
+                    results_json = json_dumps(results_content)
                     result_report_content = await self._generate_text_content(
                         topic_id=topic_id,
                         run_id=run_id,
                         agent_id=AgentId.experiment,
                         trace_id=trace_id,
-                        system_policy="You are the experiment reporting agent. Produce a detailed markdown report.",
-                        upstream_content=(
-                            f"{topic_anchor}\n\n"
-                            "<results_json>\n"
-                            f"{json.dumps(results_content, ensure_ascii=False)}\n"
-                            "</results_json>"
-                        ),
-                        final_task="Generate result.md from <upstream_reference>.",
-                        fallback_content=result_report_content,
+                        system_policy=_EXPERIMENT_REPORT_SYSTEM_POLICY,
+                        upstream_content=_wrap_upstream(topic_anchor, "results_json", results_json),
+                        final_task=_EXPERIMENT_REPORT_FINAL_TASK,
+                        fallback_factory=result_report_fallback,
                         llm_model=experiment_runtime.resolved_model,
                         max_tokens=1800,
                     )
 
-                    results_artifact = await self._create_artifact(
-                        topic_id=topic_id,
-                        run_id=run_id,
-                        name="results.json",
-                        content_type="application/json",
-                        content=results_content,
-                    )
-                    result_report_artifact = await self._create_artifact(
-                        topic_id=topic_id,
-                        run_id=run_id,
-                        name="result.md",
-                        content_type="text/markdown",
-                        content=result_report_content,
-                    )
-                    await self._emit(
-                        build_event(
-                            topic_id=topic_id,
-                            run_id=run_id,
-                            agent_id=AgentId.experiment,
-                            kind=EventKind.artifact_created,
-                            severity=Severity.info,
-                            summary="experiment produced results.json",
-                            payload={"handoffTo": "ideation", "artifactRole": "results", "metrics": metrics},
-                            artifacts=[results_artifact],
-                            trace_id=trace_id,
-                        )
-                    )
-                    await self._emit(
-                        build_event(
-                            topic_id=topic_id,
-                            run_id=run_id,
-                            agent_id=AgentId.experiment,
-                            kind=EventKind.artifact_created,
-                            severity=Severity.info,
-                            summary="experiment produced result.md",
-                            payload={"handoffTo": "ideation", "artifactRole": "result_report"},
-                            artifacts=[result_report_artifact],
-                            trace_id=trace_id,
-                        )
-                    )
-                    await self._update_agent(
+                    await self._publish_artifacts(
                         topic_id=topic_id,
                         run_id=run_id,
-                        agent_id=AgentId.experiment,
-                        status="completed",
-                        progress=1.0,
-                        summary="experiment completed",
-                        trace_id=trace_id,
+                        files=[
+                            ("results.json", "application/json", json_dumps_pretty(results_content)),
+                            ("result.md", "text/markdown", result_report_content),
+                        ],
+                        build_events=lambda artifacts: [
+                            build_event(
+                                topic_id=topic_id,
+                                run_id=run_id,
+                                agent_id=AgentId.experiment,
+                                kind=EventKind.artifact_created,
+                                severity=_SEV_INFO,
+                                summary="experiment produced results.json",
+                                payload={"handoffTo": "ideation", "artifactRole": "results", "metrics": metrics},
+                                artifacts=[artifacts[0]],
+                                trace_id=trace_id,
+                            ),
+                            build_event(
+                                topic_id=topic_id,
+                                run_id=run_id,
+                                agent_id=AgentId.experiment,
+                                kind=EventKind.artifact_created,
+                                severity=_SEV_INFO,
+                                summary="experiment produced result.md",
+                                payload={"handoffTo": "ideation", "artifactRole": "result_report"},
+                                artifacts=[artifacts[1]],
+                                trace_id=trace_id,
+                            ),
+                            self._agent_status_event(
+                                topic_id=topic_id,
+                                run_id=run_id,
+                                agent_id=AgentId.experiment,
+                                status="completed",
+                                progress=1.0,
+                                summary="experiment completed",
+                                trace_id=trace_id,
+                            ),
+                        ],
                     )
                     await self._emit_module_finished(
                         topic_id=topic_id,
@@ -1595,60 +1908,45 @@ class FakePipelineRunner:
                     raise
 
             if ideation_executed and experiment_executed:
-                active_agent = AgentId.ideation
+                active_agent = _AGENT_IDEATION
                 active_stage = "feedback"
                 await self._update_agent(
                     topic_id=topic_id,
                     run_id=run_id,
-                    agent_id=AgentId.ideation,
+                    agent_id=_AGENT_IDEATION,
                     status="running",
                     progress=0.75,
                     summary="ideation refining from experiment feedback",
                     trace_id=trace_id,
                 )
                 await self._emit(
-                    build_event(
+                    build_event_unchecked(
                         topic_id=topic_id,
                         run_id=run_id,
-                        agent_id=AgentId.ideation,
-                        kind=EventKind.event_emitted,
-                        severity=Severity.info,
+                        agent_id=_AGENT_IDEATION,
+                        kind=_EVT_EMITTED,
+                        severity=_SEV_INFO,
                         summary="refining idea from results",
-                        payload={"stage": "feedback"},
+                        payload=_STAGE_PAYLOADS["feedback"],
                         trace_id=trace_id,
                     )
                 )
                 await self._generate_text_content(
                     topic_id=topic_id,
                     run_id=run_id,
-                    agent_id=AgentId.ideation,
+                    agent_id=_AGENT_IDEATION,
                     trace_id=trace_id,
-                    system_policy="You are the ideation feedback agent.",
-                    upstream_content=(
-                        f"{topic_anchor}\n\n"
-                        "<result_report>\n"
-                        f"{result_report_content}\n"
-                        "</result_report>"
-                    ),
-                    final_task="Generate a concise feedback plan.",
-                    fallback_content=self._pick_by_lang(
-                        preferred_language,
-                        "## Feedback Plan (Fallback)\n"
-                        "- Keep effective paths\n"
-                        "- Correct failed points\n"
-                        "- Define next validation metrics\n",
-                        "## Feedback Plan (Fallback)\n"
-                        "- Keep effective paths\n"
-                        "- Correct failed points\n"
-                        "- Define next validation metrics\n",
-                    ),
+                    system_policy=_IDEATION_FEEDBACK_SYSTEM_POLICY,
+                    upstream_content=_wrap_upstream(topic_anchor, "result_report", result_report_content),
+                    final_task=_IDEATION_FEEDBACK_FINAL_TASK,
+                    fallback_factory=partial(_fallback_feedback_markdown, preferred_language),
                     llm_model=ideation_runtime.resolved_model,
                     max_tokens=1000,
                 )
                 await self._update_agent(
                     topic_id=topic_id,
                     run_id=run_id,
-                    agent_id=AgentId.ideation,
+                    agent_id=_AGENT_IDEATION,
                     status="completed",
                     progress=1.0,
                     summary="ideation feedback loop completed",
@@ -1665,63 +1963,84 @@ class FakePipelineRunner:
                 touch_ended_at=True,
             )
             await self._emit(
-                build_event(
+                build_event_unchecked(
                     topic_id=topic_id,
                     run_id=run_id,
-                    agent_id=AgentId.ideation,
-                    kind=EventKind.event_emitted,
-                    severity=Severity.info,
+                    agent_id=_AGENT_IDEATION,
+                    kind=_EVT_EMITTED,
+                    severity=_SEV_INFO,
                     summary="run completed",
-                    payload={"phase": "completed"},
+                    payload=_PAYLOAD_RUN_COMPLETED,
                     trace_id=trace_id,
                 )
             )
         except Exception as exc:
             logger.exception("Pipeline crashed (topic=%s run=%s)", topic_id, run_id)
-            try:
-                await store.update_run_runtime(
-                    run_id,
-                    topic_id=topic_id,
-                    status="failed",
-                    current_module=active_module_runtime.module if active_module_runtime else None,
-                    awaiting_approval=False,
-                    awaiting_module=None,
-                    touch_ended_at=True,
-                )
-            except Exception:
-                return
-
+            failure_events: list[Event] = []
             if active_module_runtime is not None and not module_failure_emitted:
-                await self._emit_module_failed(
+                failure_events.append(
+                    self._module_failed_event(
+                        topic_id=topic_id,
+                        run_id=run_id,
+                        trace_id=trace_id,
+                        module_runtime=active_module_runtime,
+                        exc=exc,
+                    )
+                )
+            failure_events.append(
+                self._agent_status_event(
                     topic_id=topic_id,
                     run_id=run_id,
+                    agent_id=active_agent,
+                    status="failed",
+                    progress=1.0,
+                    summary="pipeline failed",
                     trace_id=trace_id,
-                    module_runtime=active_module_runtime,
-                    exc=exc,
                 )
-
-            await self._update_agent(
-                topic_id=topic_id,
-                run_id=run_id,
-                agent_id=active_agent,
-                status="failed",
-                progress=1.0,
-                summary="pipeline failed",
-                trace_id=trace_id,
             )
-            await self._emit(
+            failure_events.append(
                 build_event(
                     topic_id=topic_id,
                     run_id=run_id,
                     agent_id=active_agent,
-                    kind=EventKind.event_emitted,
-                    severity=Severity.error,
+                    kind=_EVT_EMITTED,
+                    severity=_SEV_ERROR,
                     summary="pipeline crashed",
                     payload=self._error_payload(exc),
                     trace_id=trace_id,
                 )
             )
+
+            # Run status and failure events land in one transaction instead of
+            # a runtime update followed by separately flushed event writes.
+            try:
+                await store.fail_run(
+                    run_id,
+                    topic_id=topic_id,
+                    current_module=active_module_runtime.module if active_module_runtime else None,
+                    events=failure_events,
+                )
+            except Exception:
+                return
+            event_bus.publish_many_nowait(topic_id, failure_events)
         finally:
+            try:
+                await self._flush_events(run_id, wait=True)
+            except Exception:
+                logger.exception("Failed to persist pending events (topic=%s run=%s)", topic_id, run_id)
+                # Part of the run's event log is missing, so it cannot stand as succeeded.
+                try:
+                    await store.update_run_runtime(
+                        run_id,
+                        topic_id=topic_id,
+                        status="failed",
+                        current_module=None,
+                        awaiting_approval=False,
+                        awaiting_module=None,
+                        touch_ended_at=True,
+                    )
+                except Exception:
+                    logger.exception("Failed to mark run failed (topic=%s run=%s)", topic_id, run_id)
             await approval_manager.clear_run(run_id)
 
 
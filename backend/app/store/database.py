@@ -1,18 +1,22 @@
 ﻿from __future__ import annotations
 
 import asyncio
-import json
+import logging
 import shutil
 import time
-from datetime import datetime, timezone
+from collections import OrderedDict
+from functools import lru_cache, partial
+from operator import itemgetter
 from pathlib import Path
+from typing import Callable
 from urllib.parse import quote
 from uuid import uuid4
 
-from sqlalchemy import desc, inspect
+from sqlalchemy import ColumnElement, Row, and_, bindparam, desc, func, insert, inspect, or_, tuple_, update
 from sqlmodel import Session, delete, select
 
 from app.core.config import BACKEND_DIR, get_settings
+from app.core.jsonutil import JSONDecodeError, json_dumps, json_dumps_pretty, json_loads
 from app.db import DATABASE_URL, ENGINE, SessionLocal
 from app.models.db_models import ArtifactTable, EventTable, MessageTable, RunTable, TopicTable
 from app.models.schemas import AgentId, ArtifactRef, Event, EventKind, MessageRole, TraceItemKind
@@ -21,10 +25,53 @@ AGENT_ORDER = [AgentId.review, AgentId.ideation, AgentId.experiment]
 RUN_ACTIVE_STATUSES = {"queued", "running", "paused"}
 RUN_TERMINAL_STATUSES = {"succeeded", "failed", "canceled", "completed", "stopped"}
 _UNSET = object()
+_SNAPSHOT_CACHE_MAX_ENTRIES = 256
+_SNAPSHOT_ARTIFACT_LIMIT = 200
+_ARTIFACT_META_CACHE_MAX_ENTRIES = 4096
+
+logger = logging.getLogger(__name__)
+
+_AGENT_IDS = frozenset(AgentId._value2member_map_)
+_KIND_MESSAGE_CREATED = EventKind.message_created.value
+_KIND_ARTIFACT_CREATED = EventKind.artifact_created.value
+_KIND_AGENT_STATUS_UPDATED = EventKind.agent_status_updated.value
+_KIND_EVENT_EMITTED = EventKind.event_emitted.value
+_KIND_AGENT_SUBTASKS_UPDATED = EventKind.agent_subtasks_updated.value
+_TRACE_MESSAGE = TraceItemKind.message.value
+_TRACE_ARTIFACT = TraceItemKind.artifact.value
+_TRACE_STATUS = TraceItemKind.status.value
+_TRACE_EVENT = TraceItemKind.event.value
+# Event kinds that map onto a single timeline item:
+# kind -> (item id prefix, trace item kind, payload must be a dict).
+_TRACE_SIMPLE_KINDS: dict[str, tuple[str, str, bool]] = {
+    _KIND_AGENT_STATUS_UPDATED: ("status", _TRACE_STATUS, True),
+    _KIND_EVENT_EMITTED: ("event", _TRACE_EVENT, False),
+    _KIND_AGENT_SUBTASKS_UPDATED: ("subtasks", _TRACE_EVENT, False),
+    **dict.fromkeys(
+        (
+            EventKind.module_started.value,
+            EventKind.module_finished.value,
+            EventKind.module_skipped.value,
+            EventKind.module_failed.value,
+            EventKind.approval_required.value,
+            EventKind.approval_resolved.value,
+        ),
+        ("event", _TRACE_EVENT, False),
+    ),
+}
 
 
 def now_ms() -> int:
-    return int(time.time() * 1000)
+    return time.time_ns() // 1_000_000
+
+
+def _next_updated_at(ts: int) -> ColumnElement[int]:
+    """SQL value that moves ``topics.updated_at`` to ``ts``, or 1ms past its current value if that is newer."""
+    return func.greatest(TopicTable.updated_at + 1, ts)
+
+
+def _clamp01(value: float) -> float:
+    return max(0.0, min(float(value), 1.0))
 
 
 def _resolve_artifacts_root() -> Path:
@@ -36,8 +83,11 @@ def _resolve_artifacts_root() -> Path:
     return root
 
 
-def _json_dumps(value: object) -> str:
-    return json.dumps(value, ensure_ascii=False)
+@lru_cache(maxsize=8192)
+def _artifact_uri(topic_id: str, name: str, artifact_id: str) -> str:
+    # Snapshots and traces re-serialize the same artifacts on every poll;
+    # memoizing skips the repeated quote() calls.
+    return f"/api/topics/{topic_id}/artifacts/{quote(name)}?artifactId={quote(artifact_id)}"
 
 
 def _json_loads(value: object | None) -> object | None:
@@ -48,11 +98,28 @@ def _json_loads(value: object | None) -> object | None:
     if not isinstance(value, str):
         return None
     try:
-        return json.loads(value)
-    except json.JSONDecodeError:
+        return json_loads(value)
+    except JSONDecodeError:
         return None
 
 
+@lru_cache(maxsize=1024)
+def _decode_tags(tags_json: str | None) -> tuple:
+    # Topic reads are polled far more often than tags change; the tuple keeps
+    # the cached value immutable and callers copy it into a list.
+    tags = _json_loads(tags_json)
+    return tuple(tags) if isinstance(tags, list) else ()
+
+
+def _decode_event(row: EventTable | Row) -> tuple[dict | None, list | None]:
+    payload = _json_loads(row.payload_json)
+    artifacts = _json_loads(row.artifacts_json)
+    return (
+        payload if isinstance(payload, dict) else None,
+        artifacts if isinstance(artifacts, list) else None,
+    )
+
+
 ARTIFACTS_ROOT = _resolve_artifacts_root()
 
 _CORE_TABLES = ("topics", "runs", "events", "artifacts", "messages", "users")
@@ -83,51 +150,133 @@ def init_db() -> None:
     )
 
 
+# Column sets for read paths that only serialize rows; selecting them skips
+# ORM hydration and the unused created_at/path columns.
+_EVENT_PAYLOAD_COLUMNS = (
+    EventTable.event_id,
+    EventTable.topic_id,
+    EventTable.run_id,
+    EventTable.agent_id,
+    EventTable.kind,
+    EventTable.severity,
+    EventTable.ts,
+    EventTable.summary,
+    EventTable.payload_json,
+    EventTable.artifacts_json,
+    EventTable.trace_id,
+)
+_ARTIFACT_PAYLOAD_COLUMNS = (
+    ArtifactTable.artifact_id,
+    ArtifactTable.topic_id,
+    ArtifactTable.run_id,
+    ArtifactTable.name,
+    ArtifactTable.content_type,
+    ArtifactTable.created_at,
+)
+
+# Statements issued on every snapshot/trace/download request are built once
+# and bound per call instead of rebuilding the select() tree each time.
+_LATEST_RUN_ID_STATEMENT = (
+    select(RunTable.id)
+    .where(RunTable.topic_id == bindparam("topic_id"))
+    .order_by(desc(RunTable.created_at))
+    .limit(1)
+)
+_LATEST_ACTIVE_RUN_ID_STATEMENT = (
+    select(RunTable.id)
+    .where(
+        RunTable.topic_id == bindparam("topic_id"),
+        RunTable.status.in_(sorted(RUN_ACTIVE_STATUSES)),
+    )
+    .order_by(desc(RunTable.created_at))
+    .limit(1)
+)
+# Topic rows carry their last and active run ids as correlated scalar
+# subqueries, so topic reads need a single round trip.
+_TOPICS_WITH_RUNS_STATEMENT = select(
+    TopicTable,
+    select(RunTable.id)
+    .where(RunTable.topic_id == TopicTable.id)
+    .order_by(desc(RunTable.created_at))
+    .limit(1)
+    .correlate(TopicTable)
+    .scalar_subquery()
+    .label("last_run_id"),
+    select(RunTable.id)
+    .where(
+        RunTable.topic_id == TopicTable.id,
+        RunTable.status.in_(sorted(RUN_ACTIVE_STATUSES)),
+    )
+    .order_by(desc(RunTable.created_at))
+    .limit(1)
+    .correlate(TopicTable)
+    .scalar_subquery()
+    .label("active_run_id"),
+)
+_TOPIC_WITH_RUNS_STATEMENT = _TOPICS_WITH_RUNS_STATEMENT.where(TopicTable.id == bindparam("topic_id"))
+_TOPIC_UPDATED_AT_STATEMENT = select(TopicTable.updated_at).where(TopicTable.id == bindparam("topic_id"))
+_ORDERED_TOPICS_WITH_RUNS_STATEMENT = _TOPICS_WITH_RUNS_STATEMENT.order_by(TopicTable.created_at)
+# Traces default to the active run and fall back to the newest one.
+_TRACE_RUN_ID_STATEMENT = select(
+    func.coalesce(
+        _LATEST_ACTIVE_RUN_ID_STATEMENT.scalar_subquery(),
+        _LATEST_RUN_ID_STATEMENT.scalar_subquery(),
+    )
+)
+_ARTIFACT_BY_ID_STATEMENT = (
+    select(ArtifactTable)
+    .where(
+        ArtifactTable.topic_id == bindparam("topic_id"),
+        ArtifactTable.artifact_id == bindparam("artifact_id"),
+    )
+    .order_by(desc(ArtifactTable.created_at))
+    .limit(1)
+)
+_ARTIFACT_BY_NAME_STATEMENT = (
+    select(ArtifactTable)
+    .where(
+        ArtifactTable.topic_id == bindparam("topic_id"),
+        ArtifactTable.name == bindparam("name"),
+    )
+    .order_by(desc(ArtifactTable.created_at))
+    .limit(1)
+)
+
+
 class DatabaseStore:
     def __init__(self) -> None:
-        self._lock = asyncio.Lock()
         self._artifacts_root = ARTIFACTS_ROOT
+        # Snapshot cache: (topic_id, limit, artifact_limit) -> (topic updated_at, payload).
+        # Every write that shows up in a snapshot advances the topic's updated_at
+        # in the database, so an entry is valid only while that value is unchanged,
+        # whichever process or worker made the write.
+        self._snapshot_cache: OrderedDict[tuple[str, int, int], tuple[int, dict]] = OrderedDict()
+        # Download metadata by (topic_id, artifact_id). Artifact rows are never
+        # updated, so entries only go stale when their topic is deleted.
+        self._artifact_meta_cache: OrderedDict[tuple[str, str], dict] = OrderedDict()
 
-    def _resolve_trace_run_id(self, session: Session, topic_id: str) -> str | None:
-        active_run_id = session.exec(
-            select(RunTable.id)
-            .where(
-                RunTable.topic_id == topic_id,
-                RunTable.status.in_(RUN_ACTIVE_STATUSES),
-            )
-            .order_by(desc(RunTable.created_at))
-            .limit(1)
-        ).first()
-        if active_run_id:
-            return active_run_id
-
-        latest_run_id = session.exec(
-            select(RunTable.id)
-            .where(RunTable.topic_id == topic_id)
-            .order_by(desc(RunTable.created_at))
-            .limit(1)
-        ).first()
-        return latest_run_id
-
-    def _resolve_topic_runs(self, session: Session, topic_id: str) -> tuple[str | None, str | None]:
-        last_run_id = session.exec(
-            select(RunTable.id)
-            .where(RunTable.topic_id == topic_id)
-            .order_by(desc(RunTable.created_at))
-            .limit(1)
-        ).first()
-
-        active_run_id = session.exec(
-            select(RunTable.id)
-            .where(
-                RunTable.topic_id == topic_id,
-                RunTable.status.in_(RUN_ACTIVE_STATUSES),
-            )
-            .order_by(desc(RunTable.created_at))
-            .limit(1)
-        ).first()
+    @staticmethod
+    def _bump_topic(session: Session, topic_id: str, ts: int) -> None:
+        """Advance ``updated_at`` to ``ts`` without loading the topic; raise KeyError if it does not exist."""
+        # updated_at doubles as the snapshot cache version, so every write moves
+        # it forward, by at least 1ms if ``ts`` is not newer. The row lock orders
+        # concurrent writers, and the UPDATE rowcount doubles as the existence check.
+        touched = session.exec(
+            update(TopicTable)
+            .where(TopicTable.id == topic_id)
+            .values(updated_at=_next_updated_at(ts))
+        )
+        if touched.rowcount == 0:
+            raise KeyError(topic_id)
 
-        return last_run_id, active_run_id
+    def _forget_topic(self, topic_id: str) -> None:
+        for key in [key for key in self._snapshot_cache if key[0] == topic_id]:
+            del self._snapshot_cache[key]
+        for key in [key for key in self._artifact_meta_cache if key[0] == topic_id]:
+            del self._artifact_meta_cache[key]
+
+    def _resolve_trace_run_id(self, session: Session, topic_id: str) -> str | None:
+        return session.exec(_TRACE_RUN_ID_STATEMENT, params={"topic_id": topic_id}).one()
 
     def _topic_to_payload(
         self,
@@ -136,16 +285,13 @@ class DatabaseStore:
         last_run_id: str | None,
         active_run_id: str | None,
     ) -> dict:
-        tags_raw = _json_loads(topic.tags_json)
-        tags = tags_raw if isinstance(tags_raw, list) else []
-
         return {
             "topicId": topic.id,
             "title": topic.name,
             "historyTitle": topic.history_title,
             "description": topic.description,
             "objective": topic.objective,
-            "tags": tags,
+            "tags": list(_decode_tags(topic.tags_json)),
             "status": topic.status,
             "createdAt": topic.created_at,
             "updatedAt": topic.updated_at,
@@ -155,14 +301,11 @@ class DatabaseStore:
             "name": topic.name,
         }
 
-    def _artifact_to_payload(self, artifact: ArtifactTable) -> dict:
+    def _artifact_to_payload(self, artifact: ArtifactTable | Row) -> dict:
         return {
             "artifactId": artifact.artifact_id,
             "name": artifact.name,
-            "uri": (
-                f"/api/topics/{artifact.topic_id}/artifacts/{quote(artifact.name)}"
-                f"?artifactId={quote(artifact.artifact_id)}"
-            ),
+            "uri": _artifact_uri(artifact.topic_id, artifact.name, artifact.artifact_id),
             "contentType": artifact.content_type,
         }
 
@@ -184,46 +327,113 @@ class DatabaseStore:
             "approvalResolvedAt": run.approval_resolved_at,
         }
 
-    def _event_to_payload(self, session: Session, row: EventTable) -> dict:
-        payload_json = _json_loads(row.payload_json)
-        artifacts_json = _json_loads(row.artifacts_json)
-
-        event_payload: dict = {
-            "eventId": row.event_id,
-            "ts": row.ts,
-            "topicId": row.topic_id,
-            "runId": row.run_id,
-            "agentId": row.agent_id,
-            "kind": row.kind,
-            "severity": row.severity,
-            "summary": row.summary,
-        }
-
-        if isinstance(payload_json, dict):
-            event_payload["payload"] = payload_json
+    def _events_to_payloads(
+        self,
+        rows: list[Row],
+        decoded: list[tuple[dict | None, list | None]],
+        latest_artifact_by_run: dict[str, Row],
+    ) -> list[dict]:
+        """Serialize event rows with their already-decoded ``(payload, artifacts)`` pairs."""
+        artifact_to_payload = self._artifact_to_payload
+        payloads: list[dict] = []
+        append = payloads.append
+
+        for row, (payload_json, artifacts_json) in zip(rows, decoded):
+            event_payload: dict = {
+                "eventId": row.event_id,
+                "ts": row.ts,
+                "topicId": row.topic_id,
+                "runId": row.run_id,
+                "agentId": row.agent_id,
+                "kind": row.kind,
+                "severity": row.severity,
+                "summary": row.summary,
+            }
 
-        if isinstance(artifacts_json, list):
-            event_payload["artifacts"] = artifacts_json
+            if payload_json is not None:
+                event_payload["payload"] = payload_json
+
+            if artifacts_json is not None:
+                event_payload["artifacts"] = artifacts_json
+            elif row.kind == _KIND_ARTIFACT_CREATED:
+                latest_artifact = latest_artifact_by_run.get(row.run_id)
+                if latest_artifact is not None:
+                    event_payload["artifacts"] = [artifact_to_payload(latest_artifact)]
+
+            if row.trace_id:
+                event_payload["traceId"] = row.trace_id
+
+            append(event_payload)
+
+        return payloads
+
+    def _latest_agent_events(self, session: Session, topic_id: str) -> tuple[dict[str, Row], dict[str, Row]]:
+        """Return each agent's latest event and latest status event from one ranked query."""
+        ranked = (
+            select(
+                EventTable.agent_id,
+                EventTable.kind,
+                EventTable.ts,
+                EventTable.run_id,
+                EventTable.summary,
+                EventTable.payload_json,
+                func.row_number()
+                .over(partition_by=EventTable.agent_id, order_by=desc(EventTable.ts))
+                .label("agent_rank"),
+                func.row_number()
+                .over(partition_by=(EventTable.agent_id, EventTable.kind), order_by=desc(EventTable.ts))
+                .label("kind_rank"),
+            )
+            .where(
+                EventTable.topic_id == topic_id,
+                EventTable.agent_id.in_([agent.value for agent in AGENT_ORDER]),
+            )
+            .subquery()
+        )
 
-        if row.kind == EventKind.artifact_created.value and "artifacts" not in event_payload:
-            latest_artifact = session.exec(
-                select(ArtifactTable)
-                .where(
-                    ArtifactTable.topic_id == row.topic_id,
-                    ArtifactTable.run_id == row.run_id,
+        rows = session.exec(
+            select(*ranked.c).where(
+                or_(
+                    ranked.c.agent_rank == 1,
+                    and_(ranked.c.kind_rank == 1, ranked.c.kind == _KIND_AGENT_STATUS_UPDATED),
                 )
-                .order_by(desc(ArtifactTable.created_at))
-                .limit(1)
-            ).first()
-            if latest_artifact is not None:
-                event_payload["artifacts"] = [self._artifact_to_payload(latest_artifact)]
-
-        if row.trace_id:
-            event_payload["traceId"] = row.trace_id
-
-        return event_payload
+            )
+        ).all()
+
+        latest_by_agent: dict[str, Row] = {}
+        latest_status_by_agent: dict[str, Row] = {}
+        for row in rows:
+            if row.agent_rank == 1:
+                latest_by_agent[row.agent_id] = row
+            if row.kind_rank == 1 and row.kind == _KIND_AGENT_STATUS_UPDATED:
+                latest_status_by_agent[row.agent_id] = row
+        return latest_by_agent, latest_status_by_agent
+
+    def _latest_artifacts_by_run(self, session: Session, topic_id: str, run_ids: set[str]) -> dict[str, Row]:
+        # Only artifact_created events stored without inline artifacts need
+        # a backfill, so most snapshots skip this query entirely.
+        if not run_ids:
+            return {}
+
+        ranked = (
+            select(
+                *_ARTIFACT_PAYLOAD_COLUMNS,
+                func.row_number()
+                .over(partition_by=ArtifactTable.run_id, order_by=desc(ArtifactTable.created_at))
+                .label("run_rank"),
+            )
+            .where(ArtifactTable.topic_id == topic_id, ArtifactTable.run_id.in_(run_ids))
+            .subquery()
+        )
+        rows = session.exec(select(*ranked.c).where(ranked.c.run_rank == 1)).all()
+        return {row.run_id: row for row in rows}
 
-    def _build_agent_snapshot(self, session: Session, topic_id: str, default_ts: int) -> list[dict]:
+    @staticmethod
+    def _build_agent_snapshot(
+        latest_by_agent: dict[str, Row],
+        latest_status_by_agent: dict[str, Row],
+        default_ts: int,
+    ) -> list[dict]:
         snapshots: list[dict] = []
 
         for agent in AGENT_ORDER:
@@ -238,17 +448,7 @@ class DatabaseStore:
                 "updatedAt": default_ts,
             }
 
-            latest_status_event = session.exec(
-                select(EventTable)
-                .where(
-                    EventTable.topic_id == topic_id,
-                    EventTable.agent_id == agent.value,
-                    EventTable.kind == EventKind.agent_status_updated.value,
-                )
-                .order_by(desc(EventTable.ts))
-                .limit(1)
-            ).first()
-
+            latest_status_event = latest_status_by_agent.get(agent.value)
             if latest_status_event is not None:
                 payload = _json_loads(latest_status_event.payload_json)
                 status = None
@@ -261,23 +461,14 @@ class DatabaseStore:
                     snapshot["status"] = status
                     snapshot["state"] = status
                 if isinstance(progress, (int, float)):
-                    snapshot["progress"] = max(0.0, min(float(progress), 1.0))
+                    snapshot["progress"] = _clamp01(progress)
 
                 snapshot["lastUpdate"] = latest_status_event.ts
                 snapshot["updatedAt"] = latest_status_event.ts
                 snapshot["runId"] = latest_status_event.run_id
                 snapshot["lastSummary"] = latest_status_event.summary
 
-            latest_event = session.exec(
-                select(EventTable)
-                .where(
-                    EventTable.topic_id == topic_id,
-                    EventTable.agent_id == agent.value,
-                )
-                .order_by(desc(EventTable.ts))
-                .limit(1)
-            ).first()
-
+            latest_event = latest_by_agent.get(agent.value)
             if latest_event is not None:
                 snapshot["lastUpdate"] = latest_event.ts
                 snapshot["updatedAt"] = latest_event.ts
@@ -289,32 +480,35 @@ class DatabaseStore:
         return snapshots
 
     async def list_topics(self) -> list[dict]:
-        with SessionLocal() as session:
-            topics = session.exec(select(TopicTable).order_by(TopicTable.created_at)).all()
-            items: list[dict] = []
-            for topic in topics:
-                last_run_id, active_run_id = self._resolve_topic_runs(session, topic.id)
-                items.append(
+        def _query() -> list[dict]:
+            with SessionLocal() as session:
+                rows = session.exec(_ORDERED_TOPICS_WITH_RUNS_STATEMENT).all()
+                return [
                     self._topic_to_payload(
                         topic,
                         last_run_id=last_run_id,
                         active_run_id=active_run_id,
                     )
-                )
-            return items
+                    for topic, last_run_id, active_run_id in rows
+                ]
+
+        return await asyncio.to_thread(_query)
 
     async def get_topic(self, topic_id: str) -> dict | None:
-        with SessionLocal() as session:
-            topic = session.get(TopicTable, topic_id)
-            if topic is None:
-                return None
-
-            last_run_id, active_run_id = self._resolve_topic_runs(session, topic.id)
-            return self._topic_to_payload(
-                topic,
-                last_run_id=last_run_id,
-                active_run_id=active_run_id,
-            )
+        def _query() -> dict | None:
+            with SessionLocal() as session:
+                row = session.exec(_TOPIC_WITH_RUNS_STATEMENT, params={"topic_id": topic_id}).first()
+                if row is None:
+                    return None
+
+                topic, last_run_id, active_run_id = row
+                return self._topic_to_payload(
+                    topic,
+                    last_run_id=last_run_id,
+                    active_run_id=active_run_id,
+                )
+
+        return await asyncio.to_thread(_query)
 
     async def create_topic(
         self,
@@ -331,18 +525,20 @@ class DatabaseStore:
             history_title=None,
             description=description,
             objective=objective,
-            tags_json=_json_dumps(tags or []),
+            tags_json=json_dumps(tags or []),
             status="active",
             created_at=timestamp,
             updated_at=timestamp,
         )
 
-        async with self._lock:
+        def _write() -> None:
             with SessionLocal() as session:
                 session.add(topic)
                 session.commit()
                 session.refresh(topic)
 
+        await asyncio.to_thread(_write)
+
         return self._topic_to_payload(topic, last_run_id=None, active_run_id=None)
 
     async def create_run(
@@ -358,19 +554,28 @@ class DatabaseStore:
         del trigger, initiator, note, prompt  # Reserved for future use.
 
         timestamp = now_ms()
-        clock_part = datetime.now(tz=timezone.utc).strftime("%Y%m%d-%H%M%S")
+        # Derive the id's UTC clock part from the same reading as the timestamp.
+        clock_part = time.strftime("%Y%m%d-%H%M%S", time.gmtime(timestamp // 1000))
         run_id = f"run-{clock_part}-{uuid4().hex[:4]}"
 
-        async with self._lock:
+        def _write() -> str | None:
             with SessionLocal() as session:
-                topic = session.get(TopicTable, topic_id)
-                if topic is None:
+                # Bump the topic and read the title the run inherits in one
+                # statement instead of loading the topic row.
+                bumped = session.exec(
+                    update(TopicTable)
+                    .where(TopicTable.id == topic_id)
+                    .values(updated_at=_next_updated_at(timestamp))
+                    .returning(TopicTable.history_title)
+                ).first()
+                if bumped is None:
                     raise KeyError(topic_id)
+                history_title = bumped[0]
 
                 run = RunTable(
                     id=run_id,
                     topic_id=topic_id,
-                    history_title=topic.history_title,
+                    history_title=history_title,
                     status="queued",
                     created_at=timestamp,
                     started_at=timestamp,
@@ -381,16 +586,16 @@ class DatabaseStore:
                     config_json=config or {},
                 )
 
-                topic.updated_at = timestamp
-
                 session.add(run)
-                session.add(topic)
                 session.commit()
+                return history_title
+
+        history_title = await asyncio.to_thread(_write)
 
         return {
             "runId": run_id,
             "topicId": topic_id,
-            "historyTitle": topic.history_title,
+            "historyTitle": history_title,
             "status": "queued",
             "createdAt": timestamp,
             "startedAt": timestamp,
@@ -402,11 +607,14 @@ class DatabaseStore:
         }
 
     async def get_run(self, run_id: str) -> dict | None:
-        with SessionLocal() as session:
-            run = session.get(RunTable, run_id)
-            if run is None:
-                return None
-            return self._run_to_payload(run)
+        def _query() -> dict | None:
+            with SessionLocal() as session:
+                run = session.get(RunTable, run_id)
+                if run is None:
+                    return None
+                return self._run_to_payload(run)
+
+        return await asyncio.to_thread(_query)
 
     async def update_run_runtime(
         self,
@@ -423,7 +631,7 @@ class DatabaseStore:
     ) -> dict:
         timestamp = now_ms()
 
-        async with self._lock:
+        def _write() -> dict:
             with SessionLocal() as session:
                 run = session.get(RunTable, run_id)
                 if run is None:
@@ -431,9 +639,7 @@ class DatabaseStore:
                 if topic_id is not None and run.topic_id != topic_id:
                     raise KeyError(topic_id)
 
-                topic = session.get(TopicTable, run.topic_id)
-                if topic is None:
-                    raise KeyError(run.topic_id)
+                self._bump_topic(session, run.topic_id, timestamp)
 
                 if status is not None:
                     run.status = status
@@ -450,15 +656,15 @@ class DatabaseStore:
                 if touch_ended_at or (status in RUN_TERMINAL_STATUSES if status is not None else False):
                     run.ended_at = timestamp
 
-                topic.updated_at = timestamp
-
                 session.add(run)
-                session.add(topic)
                 session.commit()
                 session.refresh(run)
 
                 return self._run_to_payload(run)
 
+        run = await asyncio.to_thread(_write)
+        return run
+
     async def update_run_status(self, topic_id: str, run_id: str, status: str) -> None:
         await self.update_run_runtime(
             run_id,
@@ -466,159 +672,378 @@ class DatabaseStore:
             status=status,
         )
 
-    async def set_agent_status(
+    async def fail_run(
         self,
-        topic_id: str,
-        *,
-        agent_id: AgentId,
-        status: str,
-        progress: float,
         run_id: str,
-        summary: str,
+        *,
+        topic_id: str,
+        current_module: str | None,
+        events: list[Event],
     ) -> dict:
+        """Mark a run failed and append its failure events in one transaction."""
         timestamp = now_ms()
-        topic = await self.get_topic(topic_id)
-        if topic is None:
-            raise KeyError(topic_id)
+        rows = [self._event_values(event) for event in events]
+        latest_ts = max([timestamp, *(event.ts for event in events)])
 
-        return {
-            "agentId": agent_id.value,
-            "status": status,
-            "progress": max(0.0, min(progress, 1.0)),
-            "lastUpdate": timestamp,
-            "runId": run_id,
-            "lastSummary": summary,
-            "state": status,
-            "updatedAt": timestamp,
-        }
+        def _write() -> dict:
+            with SessionLocal() as session:
+                run = session.get(RunTable, run_id)
+                if run is None or run.topic_id != topic_id:
+                    raise KeyError(run_id)
 
-    async def add_event(self, event: Event) -> None:
-        payload_json = _json_dumps(event.payload) if event.payload is not None else None
+                run.status = "failed"
+                run.current_module = current_module
+                run.awaiting_approval = False
+                run.awaiting_module = None
+                run.ended_at = timestamp
+                self._bump_topic(session, topic_id, latest_ts)
+
+                if rows:
+                    session.exec(insert(EventTable), params=rows)
+                session.add(run)
+                session.commit()
+                session.refresh(run)
+
+                return self._run_to_payload(run)
+
+        run = await asyncio.to_thread(_write)
+        return run
+
+    @staticmethod
+    def _event_values(event: Event) -> dict[str, object]:
+        payload_json = json_dumps(event.payload) if event.payload is not None else None
         artifacts_json = (
-            _json_dumps([artifact.model_dump(mode="json") for artifact in event.artifacts])
+            json_dumps([artifact.model_dump(mode="json") for artifact in event.artifacts])
             if event.artifacts is not None
             else None
         )
+        return {
+            "event_id": event.eventId,
+            "topic_id": event.topicId,
+            "run_id": event.runId,
+            "agent_id": event.agentId.value,
+            "kind": event.kind.value,
+            "severity": event.severity.value,
+            "ts": event.ts,
+            "created_at": event.ts,
+            "summary": event.summary,
+            "payload_json": payload_json,
+            "artifacts_json": artifacts_json,
+            "trace_id": event.traceId,
+        }
+
+    async def add_event(self, event: Event) -> None:
+        values = self._event_values(event)
 
-        async with self._lock:
+        def _write() -> None:
             with SessionLocal() as session:
-                topic = session.get(TopicTable, event.topicId)
-                if topic is None:
-                    raise KeyError(event.topicId)
+                self._bump_topic(session, event.topicId, event.ts)
 
-                session.add(
-                    EventTable(
-                        event_id=event.eventId,
-                        topic_id=event.topicId,
-                        run_id=event.runId,
-                        agent_id=event.agentId.value,
-                        kind=event.kind.value,
-                        severity=event.severity.value,
-                        ts=event.ts,
-                        created_at=event.ts,
-                        summary=event.summary,
-                        payload_json=payload_json,
-                        artifacts_json=artifacts_json,
-                        trace_id=event.traceId,
-                    )
-                )
+                # A Core insert skips the unit-of-work flush for a row that is
+                # never read back in this session.
+                session.exec(insert(EventTable).values(**values))
+                session.commit()
 
-                topic.updated_at = max(topic.updated_at, event.ts)
-                session.add(topic)
+        await asyncio.to_thread(_write)
+
+    async def add_events(self, events: list[Event]) -> None:
+        """Persist a batch that may span several topics.
+
+        Events whose topic no longer exists are dropped with a warning so a
+        deleted topic cannot take the rest of a coalesced batch down with it.
+        """
+        if not events:
+            return
+
+        latest_ts: dict[str, int] = {}
+        for event in events:
+            latest_ts[event.topicId] = max(latest_ts.get(event.topicId, 0), event.ts)
+
+        def _write() -> set[str]:
+            missing: set[str] = set()
+            with SessionLocal() as session:
+                for topic_id, ts in latest_ts.items():
+                    try:
+                        self._bump_topic(session, topic_id, ts)
+                    except KeyError:
+                        missing.add(topic_id)
+
+                rows = [self._event_values(event) for event in events if event.topicId not in missing]
+                if rows:
+                    # One executemany for the whole batch instead of a unit-of-work
+                    # flush of individual ORM rows.
+                    session.exec(insert(EventTable), params=rows)
                 session.commit()
+            return missing
+
+        missing = await asyncio.to_thread(_write)
+        if missing:
+            logger.warning(
+                "Dropped %s event(s) for deleted topic(s): %s",
+                sum(1 for event in events if event.topicId in missing),
+                ", ".join(sorted(missing)),
+            )
 
-    async def create_artifact(
+    def _write_artifact(
         self,
         *,
         topic_id: str,
         run_id: str,
         name: str,
         content_type: str,
-        content: str | dict,
-        artifact_id: str | None = None,
-    ) -> ArtifactRef:
+        content: str | bytes | dict,
+        artifact_id: str | None,
+        created_at: int,
+    ) -> tuple[ArtifactTable, ArtifactRef]:
         safe_name = Path(name).name
         if not safe_name:
             raise ValueError("Invalid artifact name")
 
-        if isinstance(content, dict):
-            file_content = json.dumps(content, ensure_ascii=False, indent=2)
-        else:
+        # Callers that already hold serialized output pass bytes through as-is.
+        if isinstance(content, bytes):
             file_content = content
+        elif isinstance(content, dict):
+            file_content = json_dumps_pretty(content)
+        else:
+            file_content = content.encode("utf-8")
 
-        created_at = now_ms()
         artifact_key = artifact_id or f"art-{Path(safe_name).stem}-{uuid4().hex[:8]}"
 
         topic_artifact_dir = self._artifacts_root / topic_id / run_id
         topic_artifact_dir.mkdir(parents=True, exist_ok=True)
         file_path = topic_artifact_dir / safe_name
-        file_path.write_text(file_content, encoding="utf-8")
+        file_path.write_bytes(file_content)
+
+        row = ArtifactTable(
+            artifact_id=artifact_key,
+            topic_id=topic_id,
+            run_id=run_id,
+            name=safe_name,
+            content_type=content_type,
+            path=str(file_path.resolve()),
+            created_at=created_at,
+        )
+        ref = ArtifactRef(
+            artifactId=artifact_key,
+            name=safe_name,
+            uri=_artifact_uri(topic_id, safe_name, artifact_key),
+            contentType=content_type,
+        )
+        return row, ref
+
+    async def create_artifact(
+        self,
+        *,
+        topic_id: str,
+        run_id: str,
+        name: str,
+        content_type: str,
+        content: str | bytes | dict,
+        artifact_id: str | None = None,
+    ) -> ArtifactRef:
+        created_at = now_ms()
+        # Serialization and the disk write run off the event loop.
+        artifact, ref = await asyncio.to_thread(
+            partial(
+                self._write_artifact,
+                topic_id=topic_id,
+                run_id=run_id,
+                name=name,
+                content_type=content_type,
+                content=content,
+                artifact_id=artifact_id,
+                created_at=created_at,
+            )
+        )
 
-        async with self._lock:
+        def _write() -> None:
             with SessionLocal() as session:
-                topic = session.get(TopicTable, topic_id)
-                if topic is None:
-                    raise KeyError(topic_id)
+                self._bump_topic(session, topic_id, created_at)
+
+                session.add(artifact)
+                session.commit()
+
+        await asyncio.to_thread(_write)
+
+        return ref
+
+    async def create_artifacts_with_events(
+        self,
+        *,
+        topic_id: str,
+        run_id: str,
+        files: list[tuple[str, str, str | bytes | dict]],
+        build_events: Callable[[list[ArtifactRef]], list[Event]],
+    ) -> tuple[list[ArtifactRef], list[Event]]:
+        """Store ``(name, content_type, content)`` files and the events announcing them in one commit."""
+        created_at = now_ms()
 
-                artifact = ArtifactTable(
-                    artifact_id=artifact_key,
+        def _write_files() -> list[tuple[ArtifactTable, ArtifactRef]]:
+            return [
+                self._write_artifact(
                     topic_id=topic_id,
                     run_id=run_id,
-                    name=safe_name,
+                    name=name,
                     content_type=content_type,
-                    path=str(file_path.resolve()),
+                    content=content,
+                    artifact_id=None,
                     created_at=created_at,
                 )
+                for name, content_type, content in files
+            ]
 
-                topic.updated_at = created_at
+        written = await asyncio.to_thread(_write_files)
+        refs = [ref for _, ref in written]
+        events = build_events(refs)
+        rows = [self._event_values(event) for event in events]
 
-                session.add(artifact)
-                session.add(topic)
+        latest_ts = max([created_at, *(event.ts for event in events)])
+
+        def _write() -> None:
+            with SessionLocal() as session:
+                self._bump_topic(session, topic_id, latest_ts)
+
+                session.add_all([artifact for artifact, _ in written])
+                if rows:
+                    session.exec(insert(EventTable), params=rows)
                 session.commit()
 
-        return ArtifactRef(
-            artifactId=artifact_key,
-            name=safe_name,
-            uri=f"/api/topics/{topic_id}/artifacts/{quote(safe_name)}?artifactId={quote(artifact_key)}",
-            contentType=content_type,
-        )
+        await asyncio.to_thread(_write)
 
-    async def get_snapshot(self, topic_id: str, *, limit: int = 50) -> dict:
+        return refs, events
+
+    @staticmethod
+    def _load_topic_updated_at(topic_id: str) -> int | None:
         with SessionLocal() as session:
-            topic = session.get(TopicTable, topic_id)
-            if topic is None:
-                raise KeyError(topic_id)
+            return session.exec(_TOPIC_UPDATED_AT_STATEMENT, params={"topic_id": topic_id}).first()
+
+    def _load_snapshot_topic(self, session: Session, topic_id: str) -> tuple[dict, int, dict | None]:
+        row = session.exec(_TOPIC_WITH_RUNS_STATEMENT, params={"topic_id": topic_id}).first()
+        if row is None:
+            raise KeyError(topic_id)
 
-            last_run_id, active_run_id = self._resolve_topic_runs(session, topic.id)
-            active_run = session.get(RunTable, active_run_id) if active_run_id else None
+        topic, last_run_id, active_run_id = row
+        active_run = session.get(RunTable, active_run_id) if active_run_id else None
+        return (
+            self._topic_to_payload(topic, last_run_id=last_run_id, active_run_id=active_run_id),
+            topic.updated_at,
+            self._run_to_payload(active_run) if active_run is not None else None,
+        )
 
-            events_rows = session.exec(
-                select(EventTable)
-                .where(EventTable.topic_id == topic_id)
-                .order_by(desc(EventTable.ts))
-                .limit(limit)
-            ).all()
-            events_rows.reverse()
+    def _load_snapshot_events(self, session: Session, topic_id: str, limit: int) -> list[dict]:
+        events_rows = session.exec(
+            select(*_EVENT_PAYLOAD_COLUMNS)
+            .where(EventTable.topic_id == topic_id)
+            .order_by(desc(EventTable.ts))
+            .limit(limit)
+        ).all()
+        events_rows.reverse()
+
+        decoded = [_decode_event(row) for row in events_rows]
+        backfill_run_ids = {
+            row.run_id
+            for row, (_, artifacts_json) in zip(events_rows, decoded)
+            if artifacts_json is None and row.kind == _KIND_ARTIFACT_CREATED
+        }
+        latest_artifact_by_run = self._latest_artifacts_by_run(session, topic_id, backfill_run_ids)
+        return self._events_to_payloads(events_rows, decoded, latest_artifact_by_run)
 
-            artifacts_rows = session.exec(
-                select(ArtifactTable)
-                .where(ArtifactTable.topic_id == topic_id)
-                .order_by(ArtifactTable.created_at)
-            ).all()
+    def _load_artifact_page(
+        self,
+        session: Session,
+        topic_id: str,
+        *,
+        limit: int,
+        before: tuple[int, str] | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """Return up to ``limit`` artifacts older than ``before``, oldest first, and the cursor for the next page."""
+        statement = select(*_ARTIFACT_PAYLOAD_COLUMNS).where(ArtifactTable.topic_id == topic_id)
+        if before is not None:
+            # Keyset on (created_at, artifact_id): artifacts written together
+            # share a created_at, so the id breaks ties.
+            statement = statement.where(tuple_(ArtifactTable.created_at, ArtifactTable.artifact_id) < before)
+        # One extra row tells whether an older page exists.
+        artifacts_rows = session.exec(
+            statement.order_by(desc(ArtifactTable.created_at), desc(ArtifactTable.artifact_id)).limit(limit + 1)
+        ).all()
+
+        next_cursor = None
+        if len(artifacts_rows) > limit:
+            artifacts_rows = artifacts_rows[:limit]
+            oldest = artifacts_rows[-1]
+            next_cursor = f"{oldest.created_at}:{oldest.artifact_id}"
+        return [self._artifact_to_payload(row) for row in reversed(artifacts_rows)], next_cursor
+
+    async def list_artifacts(self, topic_id: str, *, limit: int, before: str | None = None) -> dict:
+        """Page through a topic's artifacts from newest to oldest; ``before`` is a cursor from an earlier page."""
+        before_key: tuple[int, str] | None = None
+        if before is not None:
+            created_at, separator, artifact_id = before.partition(":")
+            if not separator or not created_at.isdigit() or not artifact_id:
+                raise ValueError("Invalid artifact cursor")
+            before_key = (int(created_at), artifact_id)
+
+        def _query() -> tuple[list[dict], str | None]:
+            with SessionLocal() as session:
+                if session.exec(_TOPIC_UPDATED_AT_STATEMENT, params={"topic_id": topic_id}).first() is None:
+                    raise KeyError(topic_id)
+                return self._load_artifact_page(session, topic_id, limit=limit, before=before_key)
 
-            agents = self._build_agent_snapshot(session, topic_id, topic.updated_at)
+        items, next_cursor = await asyncio.to_thread(_query)
+        return {"items": items, "nextCursor": next_cursor}
 
-            return {
-                "topic": self._topic_to_payload(
-                    topic,
-                    last_run_id=last_run_id,
-                    active_run_id=active_run_id,
-                ),
-                "agents": agents,
-                "events": [self._event_to_payload(session, row) for row in events_rows],
-                "artifacts": [self._artifact_to_payload(row) for row in artifacts_rows],
-                "activeRun": self._run_to_payload(active_run) if active_run is not None else None,
-            }
+    async def get_snapshot(
+        self,
+        topic_id: str,
+        *,
+        limit: int = 50,
+        artifact_limit: int = _SNAPSHOT_ARTIFACT_LIMIT,
+    ) -> dict:
+        cache_key = (topic_id, limit, artifact_limit)
+        cached = self._snapshot_cache.get(cache_key)
+        if cached is not None:
+            updated_at = await asyncio.to_thread(self._load_topic_updated_at, topic_id)
+            if updated_at is None:
+                self._forget_topic(topic_id)
+                raise KeyError(topic_id)
+            if cached[0] == updated_at and cache_key in self._snapshot_cache:
+                self._snapshot_cache.move_to_end(cache_key)
+                return dict(cached[1])
+
+        def _load() -> tuple:
+            with SessionLocal() as session:
+                # All four reads share one REPEATABLE READ transaction, so the
+                # topic, events, artifacts and agent rows come from the same
+                # database snapshot and the request holds a single pooled connection.
+                session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+                return (
+                    self._load_snapshot_topic(session, topic_id),
+                    self._load_snapshot_events(session, topic_id, limit),
+                    self._load_artifact_page(session, topic_id, limit=artifact_limit),
+                    self._latest_agent_events(session, topic_id),
+                )
+
+        topic_result, events, (artifacts, artifacts_cursor), agent_events = await asyncio.to_thread(_load)
+        topic_payload, topic_updated_at, active_run_payload = topic_result
+        latest_by_agent, latest_status_by_agent = agent_events
+
+        snapshot = {
+            "topic": topic_payload,
+            "agents": self._build_agent_snapshot(latest_by_agent, latest_status_by_agent, topic_updated_at),
+            "events": events,
+            "artifacts": artifacts,
+            # Set when older artifacts were left out; pass it to list_artifacts.
+            "artifactsCursor": artifacts_cursor,
+            "activeRun": active_run_payload,
+        }
+
+        # Keyed by the updated_at read in the same transaction as the rest of the
+        # snapshot, so any later write retires the entry.
+        self._snapshot_cache[cache_key] = (topic_updated_at, snapshot)
+        self._snapshot_cache.move_to_end(cache_key)
+        while len(self._snapshot_cache) > _SNAPSHOT_CACHE_MAX_ENTRIES:
+            self._snapshot_cache.popitem(last=False)
+        return dict(snapshot)
 
     async def get_artifact_file(
         self,
@@ -628,62 +1053,84 @@ class DatabaseStore:
         artifact_id: str | None = None,
     ) -> dict:
         safe_name = Path(name).name
+        cache_key = (topic_id, artifact_id) if artifact_id else None
+        if cache_key is not None:
+            cached = self._artifact_meta_cache.get(cache_key)
+            # The stat can block on slow storage, so it runs off the event loop too.
+            if cached is not None and await asyncio.to_thread(Path(cached["path"]).exists):
+                if cache_key in self._artifact_meta_cache:
+                    self._artifact_meta_cache.move_to_end(cache_key)
+                return dict(cached)
+
+        def _query() -> dict:
+            with SessionLocal() as session:
+                if artifact_id:
+                    artifact = session.exec(
+                        _ARTIFACT_BY_ID_STATEMENT,
+                        params={"topic_id": topic_id, "artifact_id": artifact_id},
+                    ).first()
+                else:
+                    artifact = session.exec(
+                        _ARTIFACT_BY_NAME_STATEMENT,
+                        params={"topic_id": topic_id, "name": safe_name},
+                    ).first()
+
+                if artifact is None:
+                    raise KeyError(name)
+
+                path = Path(artifact.path)
+                if not path.exists():
+                    raise FileNotFoundError(path)
+
+                return {
+                    "path": str(path),
+                    "contentType": artifact.content_type,
+                    "name": artifact.name,
+                }
 
-        with SessionLocal() as session:
-            statement = select(ArtifactTable).where(ArtifactTable.topic_id == topic_id)
-            if artifact_id:
-                statement = statement.where(ArtifactTable.artifact_id == artifact_id)
-            else:
-                statement = statement.where(ArtifactTable.name == safe_name)
-            artifact = session.exec(
-                statement.order_by(desc(ArtifactTable.created_at)).limit(1)
-            ).first()
-
-            if artifact is None:
-                raise KeyError(name)
-
-            path = Path(artifact.path)
-            if not path.exists():
-                raise FileNotFoundError(path)
-
-            return {
-                "path": str(path),
-                "contentType": artifact.content_type,
-                "name": artifact.name,
-            }
+        meta = await asyncio.to_thread(_query)
+        # Lookups by name follow the newest artifact and are not cached.
+        if cache_key is not None:
+            self._artifact_meta_cache[cache_key] = meta
+            self._artifact_meta_cache.move_to_end(cache_key)
+            while len(self._artifact_meta_cache) > _ARTIFACT_META_CACHE_MAX_ENTRIES:
+                self._artifact_meta_cache.popitem(last=False)
+        return dict(meta)
 
     async def delete_topic(self, topic_id: str) -> None:
-        async with self._lock:
+        def _write() -> None:
             with SessionLocal() as session:
-                topic = session.get(TopicTable, topic_id)
-                if topic is None:
+                # Runs, events, artifacts and messages go with the topic through
+                # ON DELETE CASCADE. The delete row-locks the topic, so concurrent
+                # writers to it wait and then miss the row.
+                deleted = session.exec(delete(TopicTable).where(TopicTable.id == topic_id))
+                if deleted.rowcount == 0:
                     raise KeyError(topic_id)
-
-                session.exec(delete(EventTable).where(EventTable.topic_id == topic_id))
-                session.exec(delete(ArtifactTable).where(ArtifactTable.topic_id == topic_id))
-                session.exec(delete(MessageTable).where(MessageTable.topic_id == topic_id))
-                session.exec(delete(RunTable).where(RunTable.topic_id == topic_id))
-                session.delete(topic)
                 session.commit()
 
-        artifact_dir = self._artifacts_root / topic_id
-        if artifact_dir.exists():
-            shutil.rmtree(artifact_dir)
+        await asyncio.to_thread(_write)
+        self._forget_topic(topic_id)
+
+        # The rows are already gone; a leftover file must not fail the delete,
+        # and unlinking a large artifact tree must not stall the event loop.
+        await asyncio.to_thread(shutil.rmtree, self._artifacts_root / topic_id, ignore_errors=True)
 
     async def list_messages(self, topic_id: str, agent_id: AgentId) -> list[dict]:
-        topic = await self.get_topic(topic_id)
-        if topic is None:
-            raise KeyError(topic_id)
+        def _query() -> list[MessageTable]:
+            with SessionLocal() as session:
+                if session.get(TopicTable, topic_id) is None:
+                    raise KeyError(topic_id)
 
-        with SessionLocal() as session:
-            rows = session.exec(
-                select(MessageTable)
-                .where(
-                    MessageTable.topic_id == topic_id,
-                    MessageTable.agent_id == agent_id.value,
-                )
-                .order_by(MessageTable.ts)
-            ).all()
+                return session.exec(
+                    select(MessageTable)
+                    .where(
+                        MessageTable.topic_id == topic_id,
+                        MessageTable.agent_id == agent_id.value,
+                    )
+                    .order_by(MessageTable.ts)
+                ).all()
+
+        rows = await asyncio.to_thread(_query)
 
         return [
             {
@@ -707,15 +1154,16 @@ class DatabaseStore:
         content: str,
         run_id: str | None = None,
     ) -> dict:
-        topic = await self.get_topic(topic_id)
-        if topic is None:
-            raise KeyError(topic_id)
-
         message_id = str(uuid4())
         timestamp = now_ms()
 
-        async with self._lock:
+        # A plain insert needs no store-wide lock; the database orders
+        # concurrent writers across topics.
+        def _write() -> None:
             with SessionLocal() as session:
+                if session.get(TopicTable, topic_id) is None:
+                    raise KeyError(topic_id)
+
                 session.add(
                     MessageTable(
                         message_id=message_id,
@@ -729,6 +1177,8 @@ class DatabaseStore:
                 )
                 session.commit()
 
+        await asyncio.to_thread(_write)
+
         return {
             "messageId": message_id,
             "topicId": topic_id,
@@ -750,15 +1200,18 @@ class DatabaseStore:
         if not normalized:
             raise ValueError("history_title is required")
 
-        async with self._lock:
+        def _write() -> str:
             with SessionLocal() as session:
-                topic = session.get(TopicTable, topic_id)
+                # The first stored title wins; the row lock serializes racing
+                # callers for this topic only.
+                topic = session.exec(select(TopicTable).where(TopicTable.id == topic_id).with_for_update()).first()
                 if topic is None:
                     raise KeyError(topic_id)
 
                 final_title = topic.history_title.strip() if isinstance(topic.history_title, str) and topic.history_title.strip() else normalized
                 if topic.history_title != final_title:
                     topic.history_title = final_title
+                    topic.updated_at = max(topic.updated_at + 1, now_ms())
                     session.add(topic)
 
                 if run_id:
@@ -768,57 +1221,62 @@ class DatabaseStore:
                         session.add(run)
 
                 session.commit()
+                return final_title
 
+        final_title = await asyncio.to_thread(_write)
         return final_title
 
     async def get_trace(self, topic_id: str, *, run_id: str | None = None) -> dict:
-        with SessionLocal() as session:
-            topic = session.get(TopicTable, topic_id)
-            if topic is None:
-                raise KeyError(topic_id)
+        def _query() -> tuple[list[Row], list[Row], list[MessageTable], str | None]:
+            with SessionLocal() as session:
+                topic = session.get(TopicTable, topic_id)
+                if topic is None:
+                    raise KeyError(topic_id)
 
-            selected_run_id = run_id
-            if selected_run_id:
-                run = session.get(RunTable, selected_run_id)
-                if run is None or run.topic_id != topic_id:
-                    raise ValueError("Run not found")
-            else:
-                selected_run_id = self._resolve_trace_run_id(session, topic_id)
+                selected_run_id = run_id
+                if selected_run_id:
+                    run = session.get(RunTable, selected_run_id)
+                    if run is None or run.topic_id != topic_id:
+                        raise ValueError("Run not found")
+                else:
+                    selected_run_id = self._resolve_trace_run_id(session, topic_id)
+
+                event_statement = select(*_EVENT_PAYLOAD_COLUMNS).where(EventTable.topic_id == topic_id)
+                if selected_run_id:
+                    event_statement = event_statement.where(EventTable.run_id == selected_run_id)
+                event_rows = session.exec(event_statement.order_by(EventTable.ts)).all()
 
-            event_statement = select(EventTable).where(EventTable.topic_id == topic_id)
-            if selected_run_id:
-                event_statement = event_statement.where(EventTable.run_id == selected_run_id)
-            event_rows = session.exec(event_statement.order_by(EventTable.ts)).all()
+                artifact_statement = select(*_ARTIFACT_PAYLOAD_COLUMNS).where(ArtifactTable.topic_id == topic_id)
+                if selected_run_id:
+                    artifact_statement = artifact_statement.where(ArtifactTable.run_id == selected_run_id)
+                artifact_rows = session.exec(artifact_statement.order_by(ArtifactTable.created_at)).all()
 
-            artifact_statement = select(ArtifactTable).where(ArtifactTable.topic_id == topic_id)
-            if selected_run_id:
-                artifact_statement = artifact_statement.where(ArtifactTable.run_id == selected_run_id)
-            artifact_rows = session.exec(artifact_statement.order_by(ArtifactTable.created_at)).all()
+                message_statement = select(MessageTable).where(MessageTable.topic_id == topic_id)
+                if selected_run_id:
+                    message_statement = message_statement.where(MessageTable.run_id == selected_run_id)
+                message_rows = session.exec(message_statement.order_by(MessageTable.ts)).all()
+                return event_rows, artifact_rows, message_rows, selected_run_id
 
-            message_statement = select(MessageTable).where(MessageTable.topic_id == topic_id)
-            if selected_run_id:
-                message_statement = message_statement.where(MessageTable.run_id == selected_run_id)
-            message_rows = session.exec(message_statement.order_by(MessageTable.ts)).all()
+        event_rows, artifact_rows, message_rows, selected_run_id = await asyncio.to_thread(_query)
 
         timeline_items: list[dict] = []
         message_ids: set[str] = set()
         artifact_ids: set[str] = set()
 
         for row in event_rows:
-            payload_raw = _json_loads(row.payload_json)
-            payload = payload_raw if isinstance(payload_raw, dict) else {}
-            artifacts_raw = _json_loads(row.artifacts_json)
-            artifacts = artifacts_raw if isinstance(artifacts_raw, list) else []
-
-            if row.kind == EventKind.message_created.value:
-                message = payload.get("message") if isinstance(payload, dict) else None
-                if not isinstance(message, dict):
-                    continue
-
-                message_id = message.get("messageId")
-                if not isinstance(message_id, str) or not message_id:
+            payload_raw, artifacts_raw = _decode_event(row)
+            payload = payload_raw if payload_raw is not None else {}
+            artifacts = artifacts_raw if artifacts_raw is not None else []
+
+            if row.kind == _KIND_MESSAGE_CREATED:
+                # Only a JSON object accepts string subscripts, so a successful
+                # lookup doubles as the shape check for both levels.
+                try:
+                    message = payload["message"]
+                    message_id = message["messageId"]
+                except (KeyError, TypeError):
                     continue
-                if message_id in message_ids:
+                if not isinstance(message_id, str) or not message_id or message_id in message_ids:
                     continue
 
                 message_ts = message.get("ts")
@@ -827,12 +1285,16 @@ class DatabaseStore:
                 message_agent_id = message.get("agentId")
                 agent_id = (
                     message_agent_id
-                    if isinstance(message_agent_id, str) and message_agent_id in AgentId._value2member_map_
+                    if isinstance(message_agent_id, str) and message_agent_id in _AGENT_IDS
                     else row.agent_id
                 )
 
-                role = message.get("role") if isinstance(message.get("role"), str) else "assistant"
-                content = message.get("content") if isinstance(message.get("content"), str) else row.summary
+                role = message.get("role")
+                if not isinstance(role, str):
+                    role = "assistant"
+                content = message.get("content")
+                if not isinstance(content, str):
+                    content = row.summary
                 summary = f"{role}: {content[:120]}"
 
                 timeline_items.append(
@@ -840,7 +1302,7 @@ class DatabaseStore:
                         "id": f"msg-{message_id}",
                         "ts": ts,
                         "agentId": agent_id,
-                        "kind": TraceItemKind.message.value,
+                        "kind": _TRACE_MESSAGE,
                         "summary": summary,
                         "payload": {"message": message},
                     }
@@ -848,7 +1310,7 @@ class DatabaseStore:
                 message_ids.add(message_id)
                 continue
 
-            if row.kind == EventKind.artifact_created.value:
+            if row.kind == _KIND_ARTIFACT_CREATED:
                 appended = False
                 for index, artifact in enumerate(artifacts):
                     if not isinstance(artifact, dict):
@@ -863,7 +1325,7 @@ class DatabaseStore:
                     timeline_payload: dict[str, object] = {"artifact": artifact}
                     if isinstance(payload, dict):
                         handoff_to = payload.get("handoffTo")
-                        if isinstance(handoff_to, str) and handoff_to in AgentId._value2member_map_:
+                        if isinstance(handoff_to, str) and handoff_to in _AGENT_IDS:
                             timeline_payload["handoffTo"] = handoff_to
                         artifact_role = payload.get("artifactRole")
                         if isinstance(artifact_role, str) and artifact_role:
@@ -875,7 +1337,7 @@ class DatabaseStore:
                             "id": f"artifact-{artifact_id}",
                             "ts": row.ts,
                             "agentId": row.agent_id,
-                            "kind": TraceItemKind.artifact.value,
+                            "kind": _TRACE_ARTIFACT,
                             "summary": f"artifact: {name}",
                             "payload": timeline_payload,
                         }
@@ -889,76 +1351,32 @@ class DatabaseStore:
                             "id": f"artifact-{row.event_id}",
                             "ts": row.ts,
                             "agentId": row.agent_id,
-                            "kind": TraceItemKind.artifact.value,
+                            "kind": _TRACE_ARTIFACT,
                             "summary": row.summary,
                             "payload": payload or None,
                         }
                     )
                 continue
 
-            if row.kind == EventKind.agent_status_updated.value:
-                status_payload = payload if isinstance(payload, dict) else {}
-                timeline_items.append(
-                    {
-                        "id": f"status-{row.event_id}",
-                        "ts": row.ts,
-                        "agentId": row.agent_id,
-                        "kind": TraceItemKind.status.value,
-                        "summary": row.summary,
-                        "payload": status_payload or None,
-                    }
-                )
-                continue
-
-            if row.kind == EventKind.event_emitted.value:
-                timeline_items.append(
-                    {
-                        "id": f"event-{row.event_id}",
-                        "ts": row.ts,
-                        "agentId": row.agent_id,
-                        "kind": TraceItemKind.event.value,
-                        "summary": row.summary,
-                        "payload": payload or None,
-                    }
-                )
-                continue
-
-            if row.kind == EventKind.agent_subtasks_updated.value:
-                timeline_items.append(
-                    {
-                        "id": f"subtasks-{row.event_id}",
-                        "ts": row.ts,
-                        "agentId": row.agent_id,
-                        "kind": TraceItemKind.event.value,
-                        "summary": row.summary,
-                        "payload": payload or None,
-                    }
-                )
-                continue
-
-            if row.kind in {
-                EventKind.module_started.value,
-                EventKind.module_finished.value,
-                EventKind.module_skipped.value,
-                EventKind.module_failed.value,
-                EventKind.approval_required.value,
-                EventKind.approval_resolved.value,
-            }:
+            simple_kind = _TRACE_SIMPLE_KINDS.get(row.kind)
+            if simple_kind is not None:
+                id_prefix, trace_kind, dict_only = simple_kind
+                item_payload = payload if not dict_only or isinstance(payload, dict) else None
                 timeline_items.append(
                     {
-                        "id": f"event-{row.event_id}",
+                        "id": f"{id_prefix}-{row.event_id}",
                         "ts": row.ts,
                         "agentId": row.agent_id,
-                        "kind": TraceItemKind.event.value,
+                        "kind": trace_kind,
                         "summary": row.summary,
-                        "payload": payload or None,
+                        "payload": item_payload or None,
                     }
                 )
 
         for row in message_rows:
             if row.message_id in message_ids:
                 continue
-            if row.agent_id not in AgentId._value2member_map_:
+            if row.agent_id not in _AGENT_IDS:
                 continue
 
             message_payload = {
@@ -975,7 +1393,7 @@ class DatabaseStore:
                     "id": f"msg-{row.message_id}",
                     "ts": row.ts,
                     "agentId": row.agent_id,
-                    "kind": TraceItemKind.message.value,
+                    "kind": _TRACE_MESSAGE,
                     "summary": f"{row.role}: {row.content[:120]}",
                     "payload": {"message": message_payload},
                 }
@@ -999,14 +1417,16 @@ class DatabaseStore:
                     "id": f"artifact-{artifact_row.artifact_id}",
                     "ts": artifact_row.created_at,
                     "agentId": inferred_agent.value,
-                    "kind": TraceItemKind.artifact.value,
+                    "kind": _TRACE_ARTIFACT,
                     "summary": f"artifact: {artifact_row.name}",
                     "payload": {"artifact": payload},
                 }
             )
             artifact_ids.add(artifact_row.artifact_id)
 
-        timeline_items.sort(key=lambda item: item["ts"])
+        # Each source list is already in ts order from SQL, so this sort only
+        # merges the pre-sorted runs.
+        timeline_items.sort(key=itemgetter("ts"))
 
         return {
             "topicId": topic_id,
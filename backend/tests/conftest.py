@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# Store tests that need PostgreSQL run against TEST_DATABASE_URL, a disposable
+# database that is migrated to head and emptied before each test. They are
+# skipped when it is not set. It must be applied before app.db is imported.
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", "").strip()
+if TEST_DATABASE_URL:
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+
+
+@pytest.fixture(scope="session")
+def migrated_database() -> str:
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config()
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    command.upgrade(config, "head")
+    return TEST_DATABASE_URL
+
+
+@pytest.fixture
+def db_store(migrated_database: str, tmp_path: Path):
+    from app.db import ENGINE
+    from app.store.database import DatabaseStore
+
+    with ENGINE.begin() as connection:
+        connection.exec_driver_sql("TRUNCATE topics, runs, events, artifacts, messages CASCADE")
+
+    store = DatabaseStore()
+    store._artifacts_root = tmp_path
+    return store
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from app.models.schemas import AgentId, Event, EventKind, Severity
+from app.store import database
+
+
+class _FakeSession:
+    """Stands in for a Postgres session: only ``existing`` topics can be bumped."""
+
+    def __init__(self, existing: set[str], inserted: list[dict[str, object]]) -> None:
+        self._existing = existing
+        self._inserted = inserted
+        self.committed = False
+
+    def __enter__(self) -> "_FakeSession":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+    def exec(self, statement, params=None):
+        if params is not None:
+            self._inserted.extend(params)
+            return SimpleNamespace(rowcount=len(params))
+        topic_id = statement.compile().params.get("id_1")
+        return SimpleNamespace(rowcount=1 if topic_id in self._existing else 0)
+
+    def commit(self) -> None:
+        self.committed = True
+
+
+def _event(event_id: str, topic_id: str, ts: int) -> Event:
+    return Event(
+        eventId=event_id,
+        ts=ts,
+        topicId=topic_id,
+        runId="run-1",
+        agentId=AgentId.review,
+        kind=EventKind.event_emitted,
+        severity=Severity.info,
+        summary="progress",
+    )
+
+
+def test_add_events_skips_deleted_topic_and_keeps_the_rest(monkeypatch) -> None:
+    inserted: list[dict[str, object]] = []
+    sessions: list[_FakeSession] = []
+
+    def _session_factory() -> _FakeSession:
+        session = _FakeSession({"topic-live"}, inserted)
+        sessions.append(session)
+        return session
+
+    monkeypatch.setattr(database, "SessionLocal", _session_factory)
+    store = database.DatabaseStore()
+
+    asyncio.run(
+        store.add_events(
+            [
+                _event("evt-live-0001", "topic-live", 10),
+                _event("evt-gone-0001", "topic-gone", 11),
+                _event("evt-live-0002", "topic-live", 12),
+            ]
+        )
+    )
+
+    assert [row["event_id"] for row in inserted] == ["evt-live-0001", "evt-live-0002"]
+    assert sessions and sessions[0].committed
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from app.store import database
+
+
+def test_decode_event_returns_fresh_objects_per_call() -> None:
+    row = SimpleNamespace(payload_json='{"module": "review"}', artifacts_json="[]")
+
+    first_payload, _ = database._decode_event(row)
+    first_payload["module"] = "mutated"
+    second_payload, _ = database._decode_event(row)
+
+    assert second_payload == {"module": "review"}
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.models.schemas import AgentId, Event, EventKind, Severity
+from app.store.database import DatabaseStore
+
+
+def _event(event_id: str, topic_id: str, run_id: str, ts: int) -> Event:
+    return Event(
+        eventId=event_id,
+        ts=ts,
+        topicId=topic_id,
+        runId=run_id,
+        agentId=AgentId.review,
+        kind=EventKind.event_emitted,
+        severity=Severity.info,
+        summary="progress",
+    )
+
+
+def test_write_from_another_store_invalidates_cached_snapshot(db_store: DatabaseStore) -> None:
+    async def scenario() -> None:
+        topic = await db_store.create_topic(title="Snapshot cache")
+        topic_id = topic["topicId"]
+        run = await db_store.create_run(topic_id, trigger="test", initiator="test", note=None)
+
+        first = await db_store.get_snapshot(topic_id)
+        assert first["events"] == []
+        assert await db_store.get_snapshot(topic_id) == first
+
+        # A second store instance stands in for another worker process; its
+        # write has to retire the first store's cached snapshot as well.
+        other_worker = DatabaseStore()
+        # The event is older than the topic's updated_at, which must still advance.
+        await other_worker.add_events([_event("evt-snapshot-0001", topic_id, run["runId"], 1)])
+
+        second = await db_store.get_snapshot(topic_id)
+        assert [event["eventId"] for event in second["events"]] == ["evt-snapshot-0001"]
+        assert second["topic"]["updatedAt"] > first["topic"]["updatedAt"]
+
+    asyncio.run(scenario())
+
+
+def test_delete_topic_evicts_cached_snapshots(db_store: DatabaseStore) -> None:
+    async def scenario() -> None:
+        topic = await db_store.create_topic(title="Deleted topic")
+        topic_id = topic["topicId"]
+        await db_store.get_snapshot(topic_id)
+        assert any(key[0] == topic_id for key in db_store._snapshot_cache)
+
+        await db_store.delete_topic(topic_id)
+        assert not any(key[0] == topic_id for key in db_store._snapshot_cache)
+
+    asyncio.run(scenario())
+
+
+def test_snapshot_signals_truncated_artifacts_and_pages_back(db_store: DatabaseStore) -> None:
+    async def scenario() -> None:
+        topic = await db_store.create_topic(title="Many artifacts")
+        topic_id = topic["topicId"]
+        run = await db_store.create_run(topic_id, trigger="test", initiator="test", note=None)
+        refs, _ = await db_store.create_artifacts_with_events(
+            topic_id=topic_id,
+            run_id=run["runId"],
+            files=[(f"note-{index}.md", "text/markdown", f"# {index}") for index in range(5)],
+            build_events=lambda refs: [],
+        )
+        # All five share one created_at, so paging relies on the artifact id tiebreak.
+        expected = sorted(ref.artifactId for ref in refs)
+
+        snapshot = await db_store.get_snapshot(topic_id, artifact_limit=2)
+        seen = [artifact["artifactId"] for artifact in snapshot["artifacts"]]
+        cursor = snapshot["artifactsCursor"]
+        assert len(seen) == 2 and cursor is not None
+
+        while cursor is not None:
+            page = await db_store.list_artifacts(topic_id, limit=2, before=cursor)
+            seen = [artifact["artifactId"] for artifact in page["items"]] + seen
+            cursor = page["nextCursor"]
+
+        assert seen == expected
+
+        complete = await db_store.get_snapshot(topic_id)
+        assert complete["artifactsCursor"] is None
+        assert len(complete["artifacts"]) == 5
+
+    asyncio.run(scenario())
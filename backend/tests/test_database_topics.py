@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import asyncio
+
+import sqlalchemy as sa
+
+from app.db import ENGINE
+from app.models.schemas import AgentId, Event, EventKind, MessageRole, Severity
+from app.store.database import DatabaseStore
+
+_TOPIC_CHILD_TABLES = ("runs", "events", "artifacts", "messages")
+
+
+def _topic_row_counts(topic_id: str) -> dict[str, int]:
+    with ENGINE.connect() as connection:
+        return {
+            table: connection.execute(
+                sa.text(f"SELECT count(*) FROM {table} WHERE topic_id = :topic_id"),
+                {"topic_id": topic_id},
+            ).scalar_one()
+            for table in _TOPIC_CHILD_TABLES
+        }
+
+
+def test_topic_foreign_keys_cascade(db_store: DatabaseStore) -> None:
+    inspector = sa.inspect(ENGINE)
+    for table in _TOPIC_CHILD_TABLES:
+        (fk,) = [fk for fk in inspector.get_foreign_keys(table) if fk["referred_table"] == "topics"]
+        assert fk["options"].get("ondelete") == "CASCADE", table
+
+
+def test_delete_topic_removes_its_runs_events_artifacts_and_messages(db_store: DatabaseStore) -> None:
+    async def scenario() -> None:
+        doomed = (await db_store.create_topic(title="Deleted topic"))["topicId"]
+        kept = (await db_store.create_topic(title="Kept topic"))["topicId"]
+        for topic_id in (doomed, kept):
+            run = await db_store.create_run(topic_id, trigger="test", initiator="test", note=None)
+            await db_store.add_events(
+                [
+                    Event(
+                        eventId=f"evt-{topic_id}",
+                        ts=1,
+                        topicId=topic_id,
+                        runId=run["runId"],
+                        agentId=AgentId.review,
+                        kind=EventKind.event_emitted,
+                        severity=Severity.info,
+                        summary="progress",
+                    )
+                ]
+            )
+            await db_store.create_artifact(
+                topic_id=topic_id,
+                run_id=run["runId"],
+                name="notes.md",
+                content_type="text/markdown",
+                content="# notes",
+            )
+            await db_store.create_message(
+                topic_id=topic_id,
+                agent_id=AgentId.review,
+                role=MessageRole.user,
+                content="hello",
+                run_id=run["runId"],
+            )
+
+        assert _topic_row_counts(doomed) == dict.fromkeys(_TOPIC_CHILD_TABLES, 1)
+
+        await db_store.delete_topic(doomed)
+
+        assert _topic_row_counts(doomed) == dict.fromkeys(_TOPIC_CHILD_TABLES, 0)
+        assert _topic_row_counts(kept) == dict.fromkeys(_TOPIC_CHILD_TABLES, 1)
+
+    asyncio.run(scenario())
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+
+from app.core.config import Settings, get_settings
+from app.services import deepseek_client as deepseek_module
+from app.services.deepseek_client import DeepSeekClient
+
+_MESSAGES = [{"role": "user", "content": "Summarize the topic."}]
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _client(monkeypatch, *, ttl: float, max_entries: int = 256) -> tuple[DeepSeekClient, list[int]]:
+    requests: list[int] = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        requests.append(len(requests))
+        return httpx.Response(200, json={"choices": [{"message": {"content": f"answer {len(requests)}"}}]})
+
+    real_async_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        deepseek_module.httpx,
+        "AsyncClient",
+        lambda **kwargs: real_async_client(transport=httpx.MockTransport(_handler), **kwargs),
+    )
+
+    client = DeepSeekClient()
+    client._settings = get_settings().model_copy(
+        update={
+            "deepseek_api_key": "test-key",
+            "deepseek_response_cache_ttl_seconds": ttl,
+            "deepseek_response_cache_max_entries": max_entries,
+        }
+    )
+    return client, requests
+
+
+def test_response_cache_is_off_by_default(monkeypatch) -> None:
+    assert Settings.model_fields["deepseek_response_cache_ttl_seconds"].default == 0
+    client, requests = _client(monkeypatch, ttl=0)
+
+    first = asyncio.run(client.chat(_MESSAGES))
+    second = asyncio.run(client.chat(_MESSAGES))
+
+    assert (first, second) == ("answer 1", "answer 2")
+    assert len(requests) == 2
+
+
+def test_response_cache_expires_after_ttl(monkeypatch) -> None:
+    clock = _Clock()
+    monkeypatch.setattr(deepseek_module.time, "monotonic", clock)
+    client, requests = _client(monkeypatch, ttl=60)
+
+    assert asyncio.run(client.chat(_MESSAGES)) == "answer 1"
+    clock.now += 59
+    assert asyncio.run(client.chat(_MESSAGES)) == "answer 1"
+    assert len(requests) == 1
+
+    clock.now += 1
+    assert asyncio.run(client.chat(_MESSAGES)) == "answer 2"
+    assert len(requests) == 2
+
+
+def test_response_cache_evicts_least_recently_used(monkeypatch) -> None:
+    client, _ = _client(monkeypatch, ttl=60, max_entries=2)
+
+    client._cache_put("a", "A")
+    client._cache_put("b", "B")
+    assert client._cache_get("a") == "A"
+    client._cache_put("c", "C")
+
+    assert client._cache_get("b") is None
+    assert client._cache_get("a") == "A"
+    assert client._cache_get("c") == "C"
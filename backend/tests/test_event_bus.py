@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.models.schemas import AgentId, Event, EventKind, Severity
+from app.services.event_bus import EventBus
+
+
+class _FakeWebSocket:
+    def __init__(self, *, blocked: bool = False) -> None:
+        self.sent: list[str] = []
+        self.closed_with: int | None = None
+        self._unblocked = asyncio.Event()
+        if not blocked:
+            self._unblocked.set()
+
+    async def accept(self) -> None:
+        return None
+
+    async def send_text(self, data: str) -> None:
+        await self._unblocked.wait()
+        self.sent.append(data)
+
+    async def close(self, code: int = 1000) -> None:
+        self.closed_with = code
+
+
+def _event(index: int) -> Event:
+    return Event(
+        eventId=f"evt-{index:08d}",
+        ts=index,
+        topicId="topic-1",
+        runId="run-1",
+        agentId=AgentId.review,
+        kind=EventKind.event_emitted,
+        severity=Severity.info,
+        summary=f"step {index}",
+    )
+
+
+def test_lagging_subscriber_is_closed_without_costing_others_frames() -> None:
+    async def scenario() -> tuple[_FakeWebSocket, _FakeWebSocket, EventBus]:
+        bus = EventBus(max_pending_frames=4)
+        fast = _FakeWebSocket()
+        slow = _FakeWebSocket(blocked=True)
+        await bus.connect("topic-1", fast)
+        await bus.connect("topic-1", slow)
+
+        for index in range(8):
+            bus.publish_nowait("topic-1", _event(index))
+            await asyncio.sleep(0)
+        for _ in range(5):
+            await asyncio.sleep(0)
+        return fast, slow, bus
+
+    fast, slow, bus = asyncio.run(scenario())
+
+    assert len(fast.sent) == 8
+    assert slow.closed_with == 1013
+    assert bus._connections["topic-1"] == {fast}
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.services import prompt_builder
+
+
+def _build(monkeypatch, *, system_policy: str) -> list[prompt_builder.ChatMessage]:
+    monkeypatch.setattr(prompt_builder, "_load_history_rows", lambda topic_id, agent_id: [])
+    return asyncio.run(
+        prompt_builder.build_agent_prompt_context(
+            topic_id="topic-1",
+            run_id="run-1",
+            agent_id="review",
+            system_policy=system_policy,
+            upstream_content="Topic: graph neural networks",
+            final_task="Write the survey.",
+        )
+    )
+
+
+def test_build_agent_prompt_context_wraps_policy_and_upstream(monkeypatch) -> None:
+    messages = _build(monkeypatch, system_policy="  You are the review agent.  ")
+
+    assert [message["role"] for message in messages] == ["system", "user", "user"]
+    system_content = messages[0]["content"]
+    assert system_content.startswith("You are the review agent.\n\n")
+    assert system_content.endswith(prompt_builder._SYSTEM_INJECTION_GUARDRAIL)
+    assert messages[1]["content"] == (
+        "<upstream_reference>\nTopic: graph neural networks\n</upstream_reference>"
+    )
+    assert messages[2]["content"].startswith("Write the survey.\n\n")
+
+
+def test_build_agent_prompt_context_defaults_blank_policy(monkeypatch) -> None:
+    messages = _build(monkeypatch, system_policy="   ")
+
+    assert messages[0]["content"].startswith("You are a helpful research agent.\n\n")
+
+
+def test_system_message_carries_upstream_reuse_guidance(monkeypatch) -> None:
+    messages = _build(monkeypatch, system_policy="You are the ideation agent.")
+
+    system_content = messages[0]["content"]
+    assert prompt_builder._UPSTREAM_REUSE_GUIDANCE in system_content
+    assert "Reuse information already present in <upstream_reference>" in system_content
+    assert system_content.index("You are the ideation agent.") < system_content.index(
+        prompt_builder._UPSTREAM_REUSE_GUIDANCE
+    ) < system_content.index(prompt_builder._SYSTEM_INJECTION_GUARDRAIL)
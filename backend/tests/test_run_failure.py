@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.models.schemas import AgentId
+from app.services import research_agent_runner, runner
+from app.store.database import DatabaseStore
+
+
+async def _running_run(store: DatabaseStore, title: str) -> tuple[str, str]:
+    topic_id = (await store.create_topic(title=title))["topicId"]
+    run_id = (await store.create_run(topic_id, trigger="test", initiator="test", note=None))["runId"]
+    await store.update_run_runtime(
+        run_id,
+        topic_id=topic_id,
+        status="running",
+        current_module=None,
+        awaiting_approval=False,
+        awaiting_module=None,
+        touch_started_at=True,
+    )
+    return topic_id, run_id
+
+
+def _agent_status(snapshot: dict, agent_id: AgentId) -> str:
+    return next(agent["status"] for agent in snapshot["agents"] if agent["agentId"] == agent_id.value)
+
+
+@pytest.fixture
+def pipeline_store(db_store: DatabaseStore, monkeypatch) -> DatabaseStore:
+    monkeypatch.setattr(runner, "store", db_store)
+    monkeypatch.setattr(research_agent_runner, "store", db_store)
+    return db_store
+
+
+def test_fail_run_marks_run_failed_and_invalidates_snapshot(db_store: DatabaseStore) -> None:
+    async def scenario() -> None:
+        topic_id, run_id = await _running_run(db_store, "Failing run")
+        before = await db_store.get_snapshot(topic_id)
+        assert before["activeRun"]["runId"] == run_id
+
+        failure_events = [
+            runner.fake_runner._agent_status_event(
+                topic_id=topic_id,
+                run_id=run_id,
+                agent_id=AgentId.ideation,
+                status="failed",
+                progress=1.0,
+                summary="pipeline failed",
+                trace_id="trace-test",
+            ),
+            runner.build_event(
+                topic_id=topic_id,
+                run_id=run_id,
+                agent_id=AgentId.ideation,
+                kind=runner._EVT_EMITTED,
+                severity=runner._SEV_ERROR,
+                summary="pipeline crashed",
+                payload={"error": "boom"},
+                trace_id="trace-test",
+            ),
+        ]
+        failed = await db_store.fail_run(run_id, topic_id=topic_id, current_module="ideation", events=failure_events)
+
+        assert failed["status"] == "failed"
+        assert failed["currentModule"] == "ideation"
+        assert failed["endedAt"] is not None
+        assert (await db_store.get_run(run_id))["status"] == "failed"
+
+        # The cached snapshot from before the failure must not be served.
+        after = await db_store.get_snapshot(topic_id)
+        assert [event["eventId"] for event in after["events"]] == [event.eventId for event in failure_events]
+        assert after["activeRun"] is None
+        assert _agent_status(after, AgentId.ideation) == "failed"
+        assert after["topic"]["updatedAt"] > before["topic"]["updatedAt"]
+
+    asyncio.run(scenario())
+
+
+def test_fail_run_rejects_a_run_from_another_topic(db_store: DatabaseStore) -> None:
+    async def scenario() -> None:
+        _, run_id = await _running_run(db_store, "Owner")
+        other_topic_id = (await db_store.create_topic(title="Other"))["topicId"]
+        with pytest.raises(KeyError):
+            await db_store.fail_run(run_id, topic_id=other_topic_id, current_module=None, events=[])
+        assert (await db_store.get_run(run_id))["status"] == "running"
+
+    asyncio.run(scenario())
+
+
+def test_runner_crash_fails_the_run_with_its_failure_events(pipeline_store: DatabaseStore, monkeypatch) -> None:
+    pipeline = runner.FakePipelineRunner()
+
+    def _broken_config(raw_config: object) -> None:
+        raise RuntimeError("config store offline")
+
+    monkeypatch.setattr(pipeline, "_load_run_config", _broken_config)
+
+    async def scenario() -> None:
+        topic_id, run_id = await _running_run(pipeline_store, "Crashing pipeline")
+        await pipeline_store.get_snapshot(topic_id)
+
+        await pipeline.run_pipeline(topic_id, run_id)
+
+        run = await pipeline_store.get_run(run_id)
+        assert run["status"] == "failed"
+        assert run["endedAt"] is not None
+
+        snapshot = await pipeline_store.get_snapshot(topic_id)
+        crash = snapshot["events"][-1]
+        assert crash["summary"] == "pipeline crashed"
+        assert crash["severity"] == "error"
+        assert crash["payload"]["error"] == "config store offline"
+        assert _agent_status(snapshot, AgentId.review) == "failed"
+
+    asyncio.run(scenario())
+
+
+def test_research_runner_failure_fails_the_run(pipeline_store: DatabaseStore, monkeypatch) -> None:
+    pipeline = research_agent_runner.ResearchAgentPipelineRunner()
+
+    def _broken_build(**kwargs: object) -> None:
+        raise RuntimeError("docker unavailable")
+
+    monkeypatch.setattr(pipeline._runtime_builder, "build", _broken_build)
+
+    async def scenario() -> None:
+        topic_id, run_id = await _running_run(pipeline_store, "Real agent failure")
+        await pipeline_store.get_snapshot(topic_id)
+
+        await pipeline.run_pipeline(topic_id, run_id)
+
+        run = await pipeline_store.get_run(run_id)
+        assert run["status"] == "failed"
+        assert run["endedAt"] is not None
+
+        snapshot = await pipeline_store.get_snapshot(topic_id)
+        failure = snapshot["events"][-1]
+        assert failure["summary"] == "real agent pipeline failed"
+        assert failure["payload"]["error"] == "docker unavailable"
+        assert failure["payload"]["errorType"] == "RuntimeError"
+
+    asyncio.run(scenario())
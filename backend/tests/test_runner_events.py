@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.models.schemas import AgentId, Event, EventKind, Severity
+from app.services import runner
+
+
+class _FakeStore:
+    def __init__(self, failures: int = 0) -> None:
+        self.failures = failures
+        self.batches: list[list[str]] = []
+
+    async def add_events(self, events: list[Event]) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database unavailable")
+        self.batches.append([event.eventId for event in events])
+
+    @property
+    def written(self) -> list[str]:
+        return [event_id for batch in self.batches for event_id in batch]
+
+
+def _event(index: int, run_id: str = "run-1") -> Event:
+    return Event(
+        eventId=f"evt-{run_id}-{index:04d}",
+        ts=index,
+        topicId="topic-1",
+        runId=run_id,
+        agentId=AgentId.review,
+        kind=EventKind.event_emitted,
+        severity=Severity.info,
+        summary=f"step {index}",
+    )
+
+
+@pytest.fixture
+def fake_store(monkeypatch) -> _FakeStore:
+    fake = _FakeStore()
+    monkeypatch.setattr(runner, "store", fake)
+    monkeypatch.setattr(runner, "_EVENT_WRITE_RETRY_DELAYS", (0.0, 0.0))
+    return fake
+
+
+def test_flush_and_drain_persist_buffered_events_in_order(fake_store) -> None:
+    async def scenario() -> None:
+        pipeline = runner.FakePipelineRunner()
+        for index in range(3):
+            await pipeline._emit(_event(index, "run-1"))
+        await pipeline._emit(_event(0, "run-2"))
+
+        await pipeline._flush_events("run-1", wait=True)
+        assert fake_store.written == [f"evt-run-1-{index:04d}" for index in range(3)]
+
+        await pipeline.drain_events()
+        assert fake_store.written[-1] == "evt-run-2-0000"
+
+    asyncio.run(scenario())
+
+
+def test_writer_retries_a_failed_batch(fake_store) -> None:
+    fake_store.failures = 2
+
+    async def scenario() -> None:
+        pipeline = runner.FakePipelineRunner()
+        await pipeline._emit(_event(0))
+        await pipeline._emit(_event(1))
+        await pipeline._flush_events("run-1", wait=True)
+
+    asyncio.run(scenario())
+
+    assert fake_store.written == ["evt-run-1-0000", "evt-run-1-0001"]
+
+
+def test_exhausted_retries_surface_to_the_final_flush_and_drain(fake_store) -> None:
+    fake_store.failures = 100
+
+    async def scenario() -> None:
+        pipeline = runner.FakePipelineRunner()
+        await pipeline._emit(_event(0, "run-1"))
+        with pytest.raises(RuntimeError, match="database unavailable"):
+            await pipeline._flush_events("run-1", wait=True)
+
+        await pipeline._emit(_event(0, "run-2"))
+        with pytest.raises(RuntimeError, match="run-2"):
+            await pipeline.drain_events()
+
+    asyncio.run(scenario())
+
+    assert fake_store.written == []
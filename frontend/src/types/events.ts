@@ -213,6 +213,7 @@ export interface SnapshotResponse {
   agents: AgentStatus[];
   events: Event[];
   artifacts: Artifact[];
+  artifactsCursor?: string | null;
   activeRun?: {
     runId: string;
     topicId: string;